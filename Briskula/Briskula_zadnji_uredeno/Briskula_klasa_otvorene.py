@@ -1,6 +1,8 @@
 import copy
 import random                            #functions that interact strongly with the interpreter = sys
 from UCT_briskula import *
+from pozadinska_pretraga import PozadinskaPretraga
+from atlas_karata import AtlasKarata
 
 import pygame, sys          #This module provides access to some variables used or maintained by the interpreter and to
 from pygame.locals import *        #tu se QUIT nalzi...pygame.locals.konstant mozemo pisati samo konstant
@@ -11,8 +13,9 @@ ctypes.windll.user32.SetProcessDPIAware()
 
 #klasa Briskula
 class briskula:
-        def __init__(self, num_players=2):
+        def __init__(self, num_players=2, rng=None):
                 self.players = num_players #broj igraca, 2 ili 4
+                self.rng = rng or random.Random()   #odavde se dijele karte, npr. random.Random(seed) da se igra moze ponoviti (instanca, ne modul, jer se stanje salje u drugi proces)
                 self.karte = []
                 self.izasle = []
                 for i in range (40):
@@ -22,7 +25,7 @@ class briskula:
                 for i in range (self.players):
                     self.karte_za_bacanje.append(-1)        #tu cuvamo index karte koja je odabana za bacanje
                 self.pobjednik=1    # 0 ako je pobjedio 1 igrac, 1 ako je pobjedio 2 igrac
-                self.bodovi = [0, 0]
+                self.bodovi = [0, 0]     #po timovima: igraci 1 i 3 su tim 0, igraci 2 i 4 tim 1
                 self.player_na_potezu = 2   #gleda se 1 ili 2 igrac (2 igrac je komp, ako je pobjednik 1, onda je pobjedio 2 igrac)
                 self.broj_karti_na_stolu =0
                 ctypes.windll.user32.SetProcessDPIAware()
@@ -39,18 +42,22 @@ class briskula:
                 pygame.display.set_icon(pygame.image.load("icona.jpg"))
                 self.screen = pygame.display.set_mode(self.SCREEN_SIZE, 0, 32)        #SCREEN_SIZE, FULLSCREEN, 32
                 pygame.display.set_caption("Briscola")       #naslov
-                self.slike_load=[]
-                for i in range(40):
-                        self.slike_load.append(pygame.image.load("karte2/slika"+str(i)+".jpg"))
-                self.opposite = pygame.image.load("opposite1.jpg")
-                self.play_img = pygame.image.load("play.png")
-                self.next_img = pygame.image.load("next.png")
-                self.exit_img = pygame.image.load("exit.jpg")
-                self.winner_img = pygame.image.load("winner.png")
-                self.loser_img = pygame.image.load("loser.jpg")
-                self.usklicnik_img = pygame.image.load("usklicnik.jpg")
+                if not hasattr(self, "atlas"):          #sve slike su u jednom atlasu skaliranom za ovaj ekran (atlas_karata.py)
+                        self.atlas = AtlasKarata(self.y)
+                self.slike_load = self.atlas            #slike_load[k] je slika karte k
+                self.opposite = self.atlas.Slika("opposite")
+                self.play_img = self.atlas.Slika("play")
+                self.next_img = self.atlas.Slika("next")
+                self.exit_img = self.atlas.Slika("exit")
+                self.winner_img = self.atlas.Slika("winner")
+                self.loser_img = self.atlas.Slika("loser")
+                self.usklicnik_img = self.atlas.Slika("usklicnik")
+                self.razmak = self.atlas.Razmak()       #razmak izmedu karata u ruci
                 self.rect0 = []      #covjekove karte
                 self.rect1 = []      #compove_karte
+                self.font_razmisljam = pygame.font.Font("C:/Windows/Fonts/arial.TTF", 30)
+                if not hasattr(self, "pretraga"):       #proces za UCT ostaje i za sljedece igre
+                        self.pretraga = PozadinskaPretraga()
 
                 
                 
@@ -70,7 +77,7 @@ class briskula:
                         self.rect0.append(self.screen.blit(self.slike_load[self.karte_igraca[0][i]], (0.05*self.x+brojac, 0.6*self.y)))
                         self.rect1.append(self.screen.blit(self.slike_load[self.karte_igraca[1][i]], (0.05*self.x+brojac, 0.05*self.y)))
                         #self.rect1.append(self.screen.blit(self.opposite, (0.05*self.x+brojac, 0.05*self.y)))
-                        brojac+=150
+                        brojac+=self.razmak
                 brojac=0
                 if len(self.karte)!=0 and self.karte[0]!=-1:
                         rotate=pygame.transform.rotate(self.slike_load[self.briskula], 90)     #rotiranje
@@ -83,7 +90,6 @@ class briskula:
                 pygame.display.update()
                 #time.sleep(1)
         def kraj_runde(self):
-                nasao = 0
                 pocetak = 0
                 font1 = pygame.font.Font("C:/Windows/Fonts/arial.TTF", 30)
                 if len(self.karte_igraca[0])==0:
@@ -102,22 +108,20 @@ class briskula:
                                 self.screen.blit(self.loser_img, (0.05*self.x, 0.2*self.y))
                         pygame.display.update()
                         while True:
-                                for event in pygame.event.get():
-                                        if event.type == QUIT:
+                                event = pygame.event.wait()
+                                if event.type == QUIT:
+                                        pygame.quit()           #suprotno od pygame.init()
+                                        sys.exit() 
+                                if event.type == MOUSEBUTTONDOWN:
+                                        pozicija = event.pos
+                                        if rect_tmp1.collidepoint(pozicija):        #kraj igre
                                                 pygame.quit()           #suprotno od pygame.init()
-                                                sys.exit() 
-                                        if event.type == MOUSEBUTTONDOWN:
-                                                pozicija = pygame.mouse.get_pos()
-                                                if rect_tmp1.collidepoint(pozicija):        #kraj igre
-                                                        pygame.quit()           #suprotno od pygame.init()
-                                                        sys.exit()
-                                                if rect_tmp2.collidepoint(pozicija):        #igramo novu igru
-                                                        pocetak = 1
-                                                        self.__init__()
-                                                        self.pocetak()
-                                                        break
-                                if pocetak==1:
-                                        break
+                                                sys.exit()
+                                        if rect_tmp2.collidepoint(pozicija):        #igramo novu igru
+                                                pocetak = 1
+                                                self.__init__()
+                                                self.pocetak()
+                                                break
                                 
                         if pocetak==1:
                             self.bodovi=[0, 0]
@@ -130,18 +134,14 @@ class briskula:
                         rect_tmp = self.screen.blit(self.next_img, (0.15*self.x, 0.4*self.y))
                         pygame.display.update()
                         while True:
-                                for event in pygame.event.get():
-                                        if event.type == MOUSEBUTTONDOWN:
-                                                pozicija = pygame.mouse.get_pos()
-                                                if rect_tmp.collidepoint(pozicija):
-                                                        del self.rect0[:]
-                                                        del self.rect1[:]
-                                                        #self.tko_je_pobjedio()
-                                                        #self.player_na_potezu=self.pobjednik+1
-                                                        nasao=1
-                                                        break
-                                if(nasao):
-                                        break
+                                event = pygame.event.wait()
+                                if event.type == MOUSEBUTTONDOWN:
+                                        if rect_tmp.collidepoint(event.pos):
+                                                del self.rect0[:]
+                                                del self.rect1[:]
+                                                #self.tko_je_pobjedio()
+                                                #self.player_na_potezu=self.pobjednik+1
+                                                break
                                                         
                                 
                         
@@ -170,7 +170,7 @@ class briskula:
                                 for i in range (brisemo):
                                         #self.rect1[i]=self.screen.blit(self.opposite, (0.05*self.x+brojac1, 0.05*self.y))
                                         self.rect1[i] = self.screen.blit(self.slike_load[self.karte_igraca[1][i]], (0.05*self.x+brojac1, 0.05*self.y))
-                                        brojac1+=150
+                                        brojac1+=self.razmak
                                         
         
                         if klik == 0:
@@ -183,7 +183,7 @@ class briskula:
                                 self.screen.blit(rotate, (0.6*self.x, 0.55*self.y))
                                 for i in range (brisemo):
                                         self.rect0[i]=self.screen.blit(self.slike_load[self.karte_igraca[0][i]], (0.05*self.x+brojac1, 0.6*self.y))
-                                        brojac1+=150
+                                        brojac1+=self.razmak
                 if self.broj_karti_na_stolu == 1:
                         #ako je samo jedan igrac bacio kartu onda taj igrac mora prebrisati posljenju i ispisati karte normalno,
                         #jer je duljina njegovih karata realna
@@ -198,7 +198,7 @@ class briskula:
                                 for i in range (len(self.karte_igraca[1])):
                                         #self.rect1[i]=self.screen.blit(self.opposite, (0.05*self.x+brojac1, 0.05*self.y))
                                         self.rect1[i]=self.screen.blit(self.slike_load[self.karte_igraca[1][i]], (0.05*self.x+brojac1, 0.05*self.y))
-                                        brojac1+=150
+                                        brojac1+=self.razmak
                         if klik == 0:
                                 if(len(self.karte_igraca[0])==3):               
                                         brisemo = 2
@@ -209,82 +209,110 @@ class briskula:
                                 self.screen.blit(rotate, (0.6*self.x, 0.60*self.y))
                                 for i in range (len(self.karte_igraca[0])):
                                         self.rect0[i]=self.screen.blit(self.slike_load[self.karte_igraca[0][i]], (0.05*self.x+brojac1, 0.6*self.y))
-                                        brojac1+=150
+                                        brojac1+=self.razmak
                         
 
                         
                                 
                                         
         def igra_comp(self):            #UCT nam sugerira koju kartu bacamo
-                karta_za_bacanje = UCT(rootstate = self, itermax = 5000, verbose = True)
+                #UCT radi u drugom procesu, a mi za to vrijeme obradujemo dogadaje i crtamo da komp razmislja
+                #ako je razmisljao dok je covjek birao kartu, vec ima dio od 5000 posjeta pa brze zavrsi
+                rezultat = self.pretraga.Start(self, 5000)
+                sat = pygame.time.Clock()
+                tocke = 0
+                while not rezultat.ready():
+                        for event in pygame.event.get():
+                                if event.type == QUIT:
+                                        self.pretraga.Close()
+                                        pygame.quit()           #suprotno od pygame.init()
+                                        sys.exit()
+                        self.razmisljam(tocke)
+                        tocke += 1
+                        sat.tick(10)
+                self.razmisljam(-1)
+                karta_za_bacanje = rezultat.get()
                 self.DoMove(karta_za_bacanje)
                 self.ekran(1)
                 pygame.display.update()
                 if(len(self.karte)==0):
                         time.sleep(1)
+        def razmisljam(self, tocke):    #crta "Thinking..." dok UCT radi, tocke = -1 ga brise
+                rect = pygame.Rect(0.4*self.x, 0.05*self.y, 250, 40)
+                pygame.draw.rect(self.screen, self.green, rect)
+                if tocke >= 0:
+                        text = self.font_razmisljam.render("Thinking" + "."*(tocke/3%4), 1, (10, 10, 10))
+                        self.screen.blit(text, rect.topleft)
+                pygame.display.update(rect)
         def igra_covjek(self):
+                self.pretraga.Ponder(self)      #dok covjek bira kartu, UCT vec razmislja o odgovoru
+                #petlja ceka dogadaje (pygame.event.wait) umjesto da vrti procesor, a osvjezava samo okvire koji su se promijenili
+                okviri = []
+                oznacena = self.provjeri0(pygame.mouse.get_pos())      #karta ispod misa, ima crveni okvir
+                for i in range(len(self.karte_igraca[0])):
+                        if i == oznacena:
+                                okviri.append(pygame.draw.rect(self.screen,(100, 0, 0), self.rect0[i], 5))
+                        else:
+                                okviri.append(pygame.draw.rect(self.screen,self.green, self.rect0[i], 5))
+                pygame.display.update(okviri)
                 while True:
-                        gotovo = 0
-                        for i in range(len(self.karte_igraca[0])):
-                                if self.rect0[i].collidepoint(pygame.mouse.get_pos()) and gotovo==0:
-                                        pygame.draw.rect(self.screen,(100, 0, 0), self.rect0[i],5)
-                                        pygame.display.update()
-                                if self.rect0[i].collidepoint(pygame.mouse.get_pos())!=1 and gotovo==0:
-                                        pygame.draw.rect(self.screen,self.green, self.rect0[i], 5)
+                        event = pygame.event.wait()
+                        if event.type == QUIT:
+                                self.pretraga.Close()
+                                pygame.quit()           #suprotno od pygame.init()
+                                sys.exit()                   #terminates the program
+                        if event.type == MOUSEMOTION:
+                                oznacena = self.oznaci(self.provjeri0(event.pos), oznacena)
+                        if event.type == MOUSEBUTTONDOWN:
+                                odluka = self.provjeri0(event.pos)   #(pixel_x, pixel_y)
+                                if (odluka!=-1):
+                                        self.DoMove(odluka)
+                                        pygame.draw.rect(self.screen,self.green, self.rect0[odluka], 5)
+                                        self.ekran(0)
                                         pygame.display.update()
-                        for event in pygame.event.get():
-                                if event.type == QUIT:
-                                        pygame.quit()           #suprotno od pygame.init()
-                                        sys.exit()                   #terminates the program
-                                if event.type == MOUSEBUTTONDOWN:
-                                        pozicija = pygame.mouse.get_pos()   #(pixel_x, pixel_y)
-                                        odluka = self.provjeri0(pozicija)
-                                        if (odluka!=-1):
-                                                self.DoMove(odluka)
-                                                pygame.draw.rect(self.screen,self.green, self.rect0[odluka], 5)
-                                                pygame.display.update()
-                                                self.ekran(0)
-                                                pygame.display.update()
-                                                #time.sleep(2)
-                                                gotovo = 1
-                                                break
-                        if(gotovo):
-                                break
+                                        #time.sleep(2)
+                                        break
+        def oznaci(self, nova, stara):  #premjesta crveni okvir sa stare na novu kartu ispod misa (-1 = nijedna)
+                if nova == stara:
+                        return stara
+                promijenjeno = []
+                if stara != -1:
+                        promijenjeno.append(pygame.draw.rect(self.screen,self.green, self.rect0[stara], 5))
+                if nova != -1:
+                        promijenjeno.append(pygame.draw.rect(self.screen,(100, 0, 0), self.rect0[nova], 5))
+                pygame.display.update(promijenjeno)
+                return nova
    
 
         def play(self):
                 self.screen.fill(self.green)
                 rect_tmp = self.screen.blit(self.play_img, (0.42*self.x, 0.42*self.y))
-                klik=0
                 pygame.display.update()
                 while True:
-                        for event in pygame.event.get():
-                                        if event.type == QUIT:
-                                                pygame.quit()           #suprotno od pygame.init()
-                                                sys.exit() 
-                                        if event.type == MOUSEBUTTONDOWN:
-                                                pozicija = pygame.mouse.get_pos()
-                                                if rect_tmp.collidepoint(pozicija):        #kraj igre
-                                                        pygame.mixer.music.load('music1.mp3')
-                                                        pygame.mixer.music.play(0, 0.0)
-                                                        time.sleep(1)
-                                                        klik=1
-                                                        break
-                        if klik:
-                                break
+                        event = pygame.event.wait()     #spava dok se nesto ne dogodi
+                        if event.type == QUIT:
+                                pygame.quit()           #suprotno od pygame.init()
+                                sys.exit() 
+                        if event.type == MOUSEBUTTONDOWN:
+                                if rect_tmp.collidepoint(event.pos):        #kraj igre
+                                        pygame.mixer.music.load('music1.mp3')
+                                        pygame.mixer.music.play(0, 0.0)
+                                        time.sleep(1)
+                                        break
                         
 
         #Napravi kopuiju svega tako da simulacija ne utjece na orginal igru
         def Clone(self):
-                """ Create a deep clone of this game state.
+                """ Create a clone of this game state. Everything in it is a list of card ids
+                    or a number, so slicing is enough and much cheaper than copy.deepcopy.
                 """
-                st = briskula()
-                st.karte_igraca =copy.deepcopy( self.karte_igraca)
+                st = briskula(self.players, self.rng)
+                st.karte_igraca = dict((i, ruka[:]) for i, ruka in self.karte_igraca.items())
                 st.briskula = self.briskula
-                st.izasle=copy.deepcopy(self.izasle)
-                st.karte = copy.deepcopy(self.karte)
-                st.karte_za_bacanje =copy.deepcopy( self.karte_za_bacanje)
-                st.bodovi = copy.deepcopy(self.bodovi)
+                st.izasle = self.izasle[:]
+                st.karte = self.karte[:]
+                st.karte_za_bacanje = self.karte_za_bacanje[:]
+                st.bodovi = self.bodovi[:]
                 st.player_na_potezu = self.player_na_potezu
                 st.pobjednik = self.pobjednik
                 st.broj_karti_na_stolu= self.broj_karti_na_stolu
@@ -312,7 +340,7 @@ class briskula:
         def podijeli_karte_zadnji_put(self):
                 for i in range (self.player_na_potezu-1, self.players+self.player_na_potezu-2):
                         self.karte_igraca[i%self.players].append(self.dodjeli_kartu())
-                self.karte_igraca[self.player_na_potezu%self.players].append(self.briskula)
+                self.karte_igraca[(self.player_na_potezu+self.players-2)%self.players].append(self.briskula)     #briskulu dobije zadnji u krugu
                 
                 
 
@@ -367,11 +395,11 @@ class briskula:
                 return lista
 
         def GetResult(self, playerjm):
-                """ Get the game result from the viewpoint of playerjm. 
+                """ Get the game result from the viewpoint of playerjm's team.
+                    Players 1 and 3 are team 0, players 2 and 4 team 1, bodovi are per team.
                 """
-                if playerjm==2 and self.bodovi[1]>self.bodovi[0]:
-                    return 1
-                elif playerjm == 1 and self.bodovi[0]>self.bodovi[1]:
+                tim = (playerjm-1)%2
+                if self.bodovi[tim]>self.bodovi[1-tim]:
                     return 1
                 elif self.bodovi[0]==self.bodovi[1]:
                     return 0.5
@@ -393,7 +421,7 @@ class briskula:
                 return s
         
         def dodjeli_kartu(self):
-                index=random.randint(0, len(self.karte)-1)   #slucajan odabir jednog broja(karte) od preostalih
+                index=self.rng.randint(0, len(self.karte)-1)   #slucajan odabir jednog broja(karte) od preostalih
                 vratiti = self.karte[index]      #lista[index]=karta
                 self.karte.remove(self.karte[index])  #izbacimo iskoristenu kartu
                 return vratiti
@@ -404,7 +432,7 @@ class briskula:
                     self.karte_igraca[igrac].append(self.dodjeli_kartu())
 
         def postavi_briskulu(self):
-                self.briskula=self.karte[random.randint(0, len(self.karte)-1)]
+                self.briskula=self.karte[self.rng.randint(0, len(self.karte)-1)]
                 self.karte.remove(self.briskula)        #briskulu maknemo iz karti ali NE stavljamo je u iskoristene
                 
         def poeni(self,karta1):
@@ -423,7 +451,7 @@ class briskula:
                 return 0
 
         def tko_je_pobjedio(self):
-                vektor = self.trenutno_uzima(2)
+                vektor = self.trenutno_uzima(self.players)
                 self.pobjednik = vektor[1] 
                 self.bodovi[self.pobjednik%2]+=vektor[0]
         
@@ -432,48 +460,19 @@ class briskula:
         #za doMove nije dobro jer se u njemu ponisiti karta koja je bacena
         #zato je bolje korisitit self.izasle
         def trenutno_uzima(self, broj_karti_na_stolu):
-                a = []          #lista koja ima bodove na stolu, pobjednika, i najjacu kartu
-                for i in range (3):
-                    a.append(0)
-                najveca_briskula = -1
-                najveca_prva_boja = -1
+                #na stolu su zadnjih broj_karti_na_stolu karata iz izasle, prvu je bacio self.pobjednik (on je poceo krug),
+                #a i-tu igrac (self.pobjednik+i)%self.players, pa ovo radi i za 2 i za 4 igraca
+                stol = self.izasle[len(self.izasle)-broj_karti_na_stolu:]
                 poeni_u_krugu = 0
-                #ova for petlja nade najjacu kartu na stolu   treba samo jos naci ko ju je bacio
-                for i in range(broj_karti_na_stolu):
-                    nova_karta = self.izasle[len(self.izasle)- broj_karti_na_stolu + i]    #ucitavanje karata koje su na stolu
-                    if i==0:
-                        prva_karta = nova_karta
-                    poeni_u_krugu += self.poeni(nova_karta)
-                    if (self.je_li_briskula(nova_karta) and nova_karta>najveca_briskula): #provjera je li karta briskula
-                        najveca_briskula = nova_karta
-                    if (nova_karta/10 == prva_karta/10 and nova_karta>=prva_karta ): #provjera je li karta iste boje kao prva
-                        najveca_prva_boja = nova_karta
-
-
-                if(najveca_briskula != -1):     #ako ima briskule na stolu
-                    #u self.player_na_potezu imamo igraca koji je prvi igrao, npr 1.igrac onda je karta koju je on bacio predzadnja u listi izisle
-                    if(self.izasle[len(self.izasle)-2]==najveca_briskula):
-                        a[0] = poeni_u_krugu
-                        a[1] = self.pobjednik
-                        a[2] = najveca_briskula
-                        return a
-                    else:
-                        a[0] = poeni_u_krugu
-                        a[1] = (self.pobjednik+1)%2
-                        a[2] = najveca_briskula
-                        return a
-                        
-                else:
-                    if(self.izasle[len(self.izasle)-2]==najveca_prva_boja):
-                        a[0] = poeni_u_krugu
-                        a[1] = self.pobjednik
-                        a[2] = najveca_prva_boja
-                        return a
-                    else:
-                        a[0] = poeni_u_krugu
-                        a[1] = (self.pobjednik+1)%2
-                        a[2] = najveca_prva_boja
-                        return a
+                najjaca = 0     #pozicija najjace karte na stolu
+                for i in range(len(stol)):
+                    poeni_u_krugu += self.poeni(stol[i])
+                    if self.je_li_briskula(stol[i]):
+                        if not self.je_li_briskula(stol[najjaca]) or stol[i]>stol[najjaca]:
+                            najjaca = i
+                    elif stol[i]/10 == stol[najjaca]/10 and stol[i]>stol[najjaca]:     #iste boje kao najjaca, a ona nije briskula
+                        najjaca = i
+                return [poeni_u_krugu, (self.pobjednik+najjaca)%self.players, stol[najjaca]]
 
         def koja_je_to_karta(self, karta):
                 figura = ""
@@ -6,8 +6,9 @@ import time
 
 #klasa Briskula
 class briskula:
-        def __init__(self, num_players=2):
+        def __init__(self, num_players=2, rng=None):
                 self.players = num_players #broj igraca, 2 ili 4
+                self.rng = rng or random.Random()   #odavde se dijele karte, npr. random.Random(seed) da se igra moze ponoviti (instanca, ne modul, jer se stanje salje u drugi proces)
                 self.karte = []
                 self.izasle = []
                 for i in range (40):
@@ -17,21 +18,23 @@ class briskula:
                 for i in range (self.players):
                     self.karte_za_bacanje.append(-1)        #tu cuvamo index karte koja je odabana za bacanje
                 self.pobjednik=1    # 0 ako je pobjedio 1 igrac, 1 ako je pobjedio 2 igrac
-                self.bodovi = [0, 0]
+                self.bodovi = [0, 0]     #po timovima: igraci 1 i 3 su tim 0, igraci 2 i 4 tim 1
                 self.player_na_potezu = 2   #gleda se 1 ili 2 igrac (2 igrac je komp, ako je pobjednik 1, onda je pobjedio 2 igrac)
                 self.broj_karti_na_stolu =0
+                self.fiksno_dijeljenje = False   #True: karte se dijele redom iz self.karte (vidi zapis_igre.py), Clone() je opet slucajan
 
         #Napravi kopuiju svega tako da simulacija ne utjece na orginal igru
         def Clone(self):
-                """ Create a deep clone of this game state.
+                """ Create a clone of this game state. Everything in it is a list of card ids
+                    or a number, so slicing is enough and much cheaper than copy.deepcopy.
                 """
-                st = briskula()
-                st.karte_igraca =copy.deepcopy( self.karte_igraca)
+                st = briskula(self.players, self.rng)
+                st.karte_igraca = dict((i, ruka[:]) for i, ruka in self.karte_igraca.items())
                 st.briskula = self.briskula
-                st.izasle=copy.deepcopy(self.izasle)
-                st.karte = copy.deepcopy(self.karte)
-                st.karte_za_bacanje =copy.deepcopy( self.karte_za_bacanje)
-                st.bodovi = copy.deepcopy(self.bodovi)
+                st.izasle = self.izasle[:]
+                st.karte = self.karte[:]
+                st.karte_za_bacanje = self.karte_za_bacanje[:]
+                st.bodovi = self.bodovi[:]
                 st.player_na_potezu = self.player_na_potezu
                 st.pobjednik = self.pobjednik
                 st.broj_karti_na_stolu= self.broj_karti_na_stolu
@@ -59,7 +62,7 @@ class briskula:
         def podijeli_karte_zadnji_put(self):
                 for i in range (self.player_na_potezu-1, self.players+self.player_na_potezu-2):
                         self.karte_igraca[i%self.players].append(self.dodjeli_kartu())
-                self.karte_igraca[self.player_na_potezu%self.players].append(self.briskula)
+                self.karte_igraca[(self.player_na_potezu+self.players-2)%self.players].append(self.briskula)     #briskulu dobije zadnji u krugu
                 
                 
 
@@ -114,11 +117,11 @@ class briskula:
                 return lista
 
         def GetResult(self, playerjm):
-                """ Get the game result from the viewpoint of playerjm. 
+                """ Get the game result from the viewpoint of playerjm's team.
+                    Players 1 and 3 are team 0, players 2 and 4 team 1, bodovi are per team.
                 """
-                if playerjm==2 and self.bodovi[1]>self.bodovi[0]:
-                    return 1
-                elif playerjm == 1 and self.bodovi[0]>self.bodovi[1]:
+                tim = (playerjm-1)%2
+                if self.bodovi[tim]>self.bodovi[1-tim]:
                     return 1
                 elif self.bodovi[0]==self.bodovi[1]:
                     return 0.5
@@ -140,7 +143,9 @@ class briskula:
                 return s
         
         def dodjeli_kartu(self):
-                index=random.randint(0, len(self.karte)-1)   #slucajan odabir jednog broja(karte) od preostalih
+                if self.fiksno_dijeljenje:
+                    return self.karte.pop(0)
+                index=self.rng.randint(0, len(self.karte)-1)   #slucajan odabir jednog broja(karte) od preostalih
                 vratiti = self.karte[index]      #lista[index]=karta
                 self.karte.remove(self.karte[index])  #izbacimo iskoristenu kartu
                 return vratiti
@@ -151,7 +156,10 @@ class briskula:
                     self.karte_igraca[igrac].append(self.dodjeli_kartu())
 
         def postavi_briskulu(self):
-                self.briskula=self.karte[random.randint(0, len(self.karte)-1)]
+                if self.fiksno_dijeljenje:
+                    self.briskula = self.karte.pop(0)
+                    return
+                self.briskula=self.karte[self.rng.randint(0, len(self.karte)-1)]
                 self.karte.remove(self.briskula)        #briskulu maknemo iz karti ali NE stavljamo je u iskoristene
                 
         def poeni(self,karta1):
@@ -170,7 +178,7 @@ class briskula:
                 return 0
 
         def tko_je_pobjedio(self):
-                vektor = self.trenutno_uzima(2)
+                vektor = self.trenutno_uzima(self.players)
                 self.pobjednik = vektor[1] 
                 self.bodovi[self.pobjednik%2]+=vektor[0]
         
@@ -179,48 +187,19 @@ class briskula:
         #za doMove nije dobro jer se u njemu ponisiti karta koja je bacena
         #zato je bolje korisitit self.izasle
         def trenutno_uzima(self, broj_karti_na_stolu):
-                a = []          #lista koja ima bodove na stolu, pobjednika, i najjacu kartu
-                for i in range (3):
-                    a.append(0)
-                najveca_briskula = -1
-                najveca_prva_boja = -1
+                #na stolu su zadnjih broj_karti_na_stolu karata iz izasle, prvu je bacio self.pobjednik (on je poceo krug),
+                #a i-tu igrac (self.pobjednik+i)%self.players, pa ovo radi i za 2 i za 4 igraca
+                stol = self.izasle[len(self.izasle)-broj_karti_na_stolu:]
                 poeni_u_krugu = 0
-                #ova for petlja nade najjacu kartu na stolu   treba samo jos naci ko ju je bacio
-                for i in range(broj_karti_na_stolu):
-                    nova_karta = self.izasle[len(self.izasle)- broj_karti_na_stolu + i]    #ucitavanje karata koje su na stolu
-                    if i==0:
-                        prva_karta = nova_karta
-                    poeni_u_krugu += self.poeni(nova_karta)
-                    if (self.je_li_briskula(nova_karta) and nova_karta>najveca_briskula): #provjera je li karta briskula
-                        najveca_briskula = nova_karta
-                    if (nova_karta/10 == prva_karta/10 and nova_karta>=prva_karta ): #provjera je li karta iste boje kao prva
-                        najveca_prva_boja = nova_karta
-
-
-                if(najveca_briskula != -1):     #ako ima briskule na stolu
-                    #u self.player_na_potezu imamo igraca koji je prvi igrao, npr 1.igrac onda je karta koju je on bacio predzadnja u listi izisle
-                    if(self.izasle[len(self.izasle)-2]==najveca_briskula):
-                        a[0] = poeni_u_krugu
-                        a[1] = self.pobjednik
-                        a[2] = najveca_briskula
-                        return a
-                    else:
-                        a[0] = poeni_u_krugu
-                        a[1] = (self.pobjednik+1)%2
-                        a[2] = najveca_briskula
-                        return a
-                        
-                else:
-                    if(self.izasle[len(self.izasle)-2]==najveca_prva_boja):
-                        a[0] = poeni_u_krugu
-                        a[1] = self.pobjednik
-                        a[2] = najveca_prva_boja
-                        return a
-                    else:
-                        a[0] = poeni_u_krugu
-                        a[1] = (self.pobjednik+1)%2
-                        a[2] = najveca_prva_boja
-                        return a
+                najjaca = 0     #pozicija najjace karte na stolu
+                for i in range(len(stol)):
+                    poeni_u_krugu += self.poeni(stol[i])
+                    if self.je_li_briskula(stol[i]):
+                        if not self.je_li_briskula(stol[najjaca]) or stol[i]>stol[najjaca]:
+                            najjaca = i
+                    elif stol[i]/10 == stol[najjaca]/10 and stol[i]>stol[najjaca]:     #iste boje kao najjaca, a ona nije briskula
+                        najjaca = i
+                return [poeni_u_krugu, (self.pobjednik+najjaca)%self.players, stol[najjaca]]
 
         def koja_je_to_karta(self, karta):
                 figura = ""
@@ -2,70 +2,69 @@ import copy
 import random
 from math import *
 
+UKUPNO_BODOVA = 120
+
+def odluceno(state):
+    """ True once the result can no longer change: the lead is bigger than the points
+        still in play (or nothing is left to win), so GetResult is already final.
+    """
+    preostalo = UKUPNO_BODOVA - state.bodovi[0] - state.bodovi[1]
+    return preostalo == 0 or abs(state.bodovi[0] - state.bodovi[1]) > preostalo
+
+def nezavisni_tok(seed, i = 0):
+    """ The i-th random stream derived from a master seed: random.Random(seed) moved far
+        away with jumpahead(i), so every worker (game, engine) can get its own stream and
+        the whole run is reproducible from seed alone.
+    """
+    rng = random.Random(seed)
+    rng.jumpahead(i)
+    return rng
+
 class Node:
     """ A node in the game tree. Note wins is always from the viewpoint of player_na_potezu.
         Crashes if state not specified.
     """
-    def __init__(self, move = None, parent = None, state = None):
+    def __init__(self, move = None, parent = None, state = None, priors = None):
         self.move = move # the move that got us to this node - "None" for the root node
         self.parentNode = parent # "None" for the root node
         self.childNodes = []
         self.wins = 0
+        self.wins2 = 0 # suma kvadrata rezultata, treba za UCB1-Tuned
         self.visits = 0
         self.untriedMoves = state.GetMoves() # future child nodes
+        if parent != None and odluceno(state):
+            self.untriedMoves = [] # odlucena igra je za pretragu terminalna (korijen ne, jer moramo vratiti potez)
         self.player_na_potezu = state.player_na_potezu # the only part of the state that the Node needs later
         self.bodovi=state.bodovi
         self.prvi_igrac = state.player_na_potezu
-    #ne treba nicemo nista radit s tom listom TREBA    
-        #pricaj tamo 
-    def UCTSelectChild(self):
-        """ Use the UCB1 formula to select a child node. Often a constant UCTK is applied so we have
-            lambda c: c.wins/c.visits + UCTK * sqrt(2*log(self.visits)/c.visits to vary the amount of
-            exploration versus exploitation.
+        self.priors = priors # {potez: vjerojatnost} za djecu, koristi ga samo PUCT
+        self.prior = 1.0
+        if parent != None and parent.priors != None:
+            self.prior = parent.priors.get(move, 0.0)
+
+    def UCTSelectChild(self, selekcija = None):
+        """ Select a child node with the given selection policy (plain UCB1 with
+            UCTK = sqrt(2) if no policy is given).
         """
-        maxNode = None
-        maxi = -1.0
-        mini = 1.1
-        minNode=None
-        #moramo vratiti cvor koji je najbolji iz perspektive roditelja
-        #biramo dijete koje nam je donijelo najvise pobjeda
-        for i in range (len(self.childNodes)):
-            if(maxi < float(self.childNodes[i].wins)/float(self.childNodes[i].visits)+ sqrt(2*log(self.visits)/self.childNodes[i].visits)):
-                maxNode = self.childNodes[i]
-                maxi = float(self.childNodes[i].wins)/float(self.childNodes[i].visits)+sqrt(2*log(self.visits)/self.childNodes[i].visits)
-            """#zelimo najveci umjer u kojem pobjedjuje komp ili najmanjii omjer u kojem pobjedjuje covjek
-            if(maxi<float(self.childNodes[i].wins)/float(self.childNodes[i].visits)and self.childNodes[i].player_na_potezu == 2):
-                maxi = float(self.childNodes[i].wins)/float(self.childNodes[i].visits)
-                maxNode = self.childNodes[i]
-            if(mini>float(self.childNodes[i].wins)/float(self.childNodes[i].visits)and self.childNodes[i].player_na_potezu == 1):
-                mini = float(self.childNodes[i].wins)/float(self.childNodes[i].visits)
-                minNode = self.childNodes[i]
-        #print mini
-        #print maxi
-        if(1-mini>maxi):
-            return minNode
-        else:
-            return maxNode"""
-        #print "U SELCET CHILD "+str(maxi)
-        
-        return maxNode
-       
-        
-    
-    def AddChild(self, m, s):
+        if selekcija == None:
+            selekcija = UCB1()
+        return selekcija.SelectChild(self)
+
+    def AddChild(self, m, s, priors = None):
         """ Remove m from untriedMoves and add a new child node for this move.
             Return the added child node
         """
-        n = Node(move = m, parent = self, state = s)
+        n = Node(move = m, parent = self, state = s, priors = priors)
         self.untriedMoves.remove(m)
         self.childNodes.append(n)
         return n
-    
+
     def Update(self, result):
         """ Update this node - one additional visit and result additional wins. result must be from the viewpoint of player_na_potezu.
         """
         self.visits += 1
         self.wins += result
+        self.wins2 += result*result
 
     def __repr__(self):
         return "[M:" + str(self.move) + " W/V:" + str(self.wins) + "/" + str(self.visits) + " U:" + str(self.untriedMoves) + "]"+"potez igra "+str(self.player_na_potezu)
@@ -95,227 +94,299 @@ class Node:
              s += str(c) + "\n"
         return s
 
-def UCT(rootstate, itermax, verbose = False, brojac=-1):
-    """ Conduct a UCT search for itermax iterations starting from rootstate.
-        Return the best move from the rootstate.
-        Assumes 2 alternating players (player 1 starts), with game results in the range [0.0, 1.0]."""
-
-    rootnode = Node(state = rootstate)
-    pobjednik = rootstate.pobjednik
-    for i in range(itermax):
-        node = rootnode
-        state = rootstate.Clone()
-        j = brojac
-        j=brojac
-        # Select
-        while node.untriedMoves == [] and node.childNodes != []: # node is fully expanded and non-terminal
-            node = node.UCTSelectChild()
-            #print state.print1()+" "+str(node.move)+" select"
-            state.DoMove(node.move)
-            j+=1            
-
-        # Expand
-        if node.untriedMoves != []: # if we can expand (i.e. state/node is non-terminal)
-            m = random.choice(node.untriedMoves)
-            #print state.print1()+" "+str(node.move)+" expand "+str(j)
-            state.DoMove(m)
-            j+=1
-            node = node.AddChild(m,state) # add child and descend tree
-            
-            
-        
-        # Rollout - this can often be made orders of magnitude quicker using a state.GetRandomMove() function
-        while state.GetMoves() != []: # while state is non-terminal
-            izbacujem_kartu = random.choice(state.GetMoves())
-            #print state.print1()+str(node.move)+" rollout"
-            state.DoMove(izbacujem_kartu)
-            j+=1
-
-            
-        # Backpropagate
-        while node != None: # backpropagate from the expanded node and work back to the root node
-            #print str(node.player_na_potezu)+" je prosao s "+str(state.GetResult(node.player_na_potezu))
-            if(node.parentNode!=None):
-                node.Update(state.GetResult(node.parentNode.player_na_potezu)) # state is terminal. Update node with result from POV of node.player_na_potezu
-            else:
-                node.Update(state.GetResult(1))
-            node = node.parentNode
-            
-        #print "na kraju iteracije j je "+str(j)
-       
-    if (verbose==False): print rootnode.TreeToString(0)
-    #else: print rootnode.ChildrenToString()
-    
-    
-    # Output some information about the tree - can be omitted
-    #print "prosli smo"+str(j)
-    
-
-    return sorted(rootnode.childNodes, key = lambda c: c.visits)[-1].move # return the move that was most visited
-
-
-
-
-
-
-###Koristimo Node2 i UCT2 kod provjere UCT_vs_UCT s razlicitim koeficijentima
-###treba promijeniti koeficijent u UCTSelectChild ispred sqrt
-
-class Node2:
-    """ A node in the game tree. Note wins is always from the viewpoint of player_na_potezu.
-        Crashes if state not specified.
+
+###Politike selekcije. Svaka ima SelectChild(node) koji vraca dijete koje je najbolje
+###iz perspektive roditelja, i Priors(state, moves) koji vraca pocetne vjerojatnosti
+###poteza (ili None ako ih politika ne koristi).
+
+class UCB1:
+    """ UCB1: c.wins/c.visits + c * sqrt(log(self.visits)/c.visits).
+        c = sqrt(2) is the coefficient the original UCT used, the old UCT2 used c = 100.
     """
-    def __init__(self, move = None, parent = None, state = None):
-        self.move = move # the move that got us to this node - "None" for the root node
-        self.parentNode = parent # "None" for the root node
-        self.childNodes = []
-        self.wins = 0
-        self.visits = 0
-        self.untriedMoves = state.GetMoves() # future child nodes
-        self.player_na_potezu = state.player_na_potezu # the only part of the state that the Node needs later
-        self.bodovi=state.bodovi
-        self.prvi_igrac = state.player_na_potezu
-    #ne treba nicemo nista radit s tom listom TREBA    
-        #pricaj tamo 
-    def UCTSelectChild(self):
-        """ Use the UCB1 formula to select a child node. Often a constant UCTK is applied so we have
-            lambda c: c.wins/c.visits + UCTK * sqrt(2*log(self.visits)/c.visits to vary the amount of
-            exploration versus exploitation.
-        """
+    def __init__(self, c = sqrt(2)):
+        self.c = c
+
+    def Priors(self, state, moves):
+        return None
+
+    def Score(self, parent, child):
+        return float(child.wins)/child.visits + self.c*sqrt(log(parent.visits)/child.visits)
+
+    def SelectChild(self, node):
+        #moramo vratiti cvor koji je najbolji iz perspektive roditelja
         maxNode = None
         maxi = -1.0
-        mini = 1.1
-        minNode=None
-        #moramo vratiti cvor koji je najbolji iz perspektive roditelja
-        #biramo dijete koje nam je donijelo najvise pobjeda
-        for i in range (len(self.childNodes)):
-            if(maxi < float(self.childNodes[i].wins)/float(self.childNodes[i].visits)+ 100*sqrt(1*log(self.visits)/self.childNodes[i].visits)):
-                maxNode = self.childNodes[i]
-                maxi = float(self.childNodes[i].wins)/float(self.childNodes[i].visits)+100*sqrt(1*log(self.visits)/self.childNodes[i].visits)
-            """#zelimo najveci umjer u kojem pobjedjuje komp ili najmanjii omjer u kojem pobjedjuje covjek
-            if(maxi<float(self.childNodes[i].wins)/float(self.childNodes[i].visits)and self.childNodes[i].player_na_potezu == 2):
-                maxi = float(self.childNodes[i].wins)/float(self.childNodes[i].visits)
-                maxNode = self.childNodes[i]
-            if(mini>float(self.childNodes[i].wins)/float(self.childNodes[i].visits)and self.childNodes[i].player_na_potezu == 1):
-                mini = float(self.childNodes[i].wins)/float(self.childNodes[i].visits)
-                minNode = self.childNodes[i]
-        #print mini
-        #print maxi
-        if(1-mini>maxi):
-            return minNode
-        else:
-            return maxNode"""
-        #print "U SELCET CHILD "+str(maxi)
-        
+        for c in node.childNodes:
+            ocjena = self.Score(node, c)
+            if(maxi < ocjena):
+                maxNode = c
+                maxi = ocjena
         return maxNode
-       
-        
-    
-    def AddChild(self, m, s):
-        """ Remove m from untriedMoves and add a new child node for this move.
-            Return the added child node
-        """
-        n = Node(move = m, parent = self, state = s)
-        self.untriedMoves.remove(m)
-        self.childNodes.append(n)
-        return n
-    
-    def Update(self, result):
-        """ Update this node - one additional visit and result additional wins. result must be from the viewpoint of player_na_potezu.
-        """
-        self.visits += 1
-        self.wins += result
 
     def __repr__(self):
-        return "[M:" + str(self.move) + " W/V:" + str(self.wins) + "/" + str(self.visits) + " U:" + str(self.untriedMoves) + "]"+"potez igra "+str(self.player_na_potezu)
+        return "UCB1(c=" + str(self.c) + ")"
 
-    def TreeToString(self, indent):
-        #ovo je ako zelimo ispisati citav score po potezima UCT-a
-        """s = self.IndentString(indent) + str(self)
-        for c in self.childNodes:
-             s += c.TreeToString(indent+1)
-        return s"""
 
-        #ovo je ako zelimo ispisati samo stablo do dubine 1
-        s = self.IndentString(indent) + str(self)
-        for c in self.childNodes:
-             s += c.IndentString(indent+1)+ str(c)
-        return s
+class UCB1Tuned(UCB1):
+    """ UCB1-Tuned (Auer et al.): the exploration term is scaled with an upper bound
+        on the variance of the child's results instead of the fixed 1/4.
+    """
+    def __init__(self, c = 1.0):
+        self.c = c
 
-    def IndentString(self,indent):
-        s = "\n"
-        for i in range (1,indent+1):
-            s += "| "
-        return s
+    def Score(self, parent, child):
+        prosjek = float(child.wins)/child.visits
+        logN = log(parent.visits)
+        varijanca = float(child.wins2)/child.visits - prosjek*prosjek + sqrt(2*logN/child.visits)
+        return prosjek + self.c*sqrt(logN/child.visits*min(0.25, varijanca))
 
-    def ChildrenToString(self):
-        s = ""
-        for c in self.childNodes:
-             s += str(c) + "\n"
-        return s
+    def __repr__(self):
+        return "UCB1Tuned(c=" + str(self.c) + ")"
+
+
+def uniformni_priori(state, moves):
+    """ Default PUCT prior: every move is equally likely.
+    """
+    return dict((m, 1.0/len(moves)) for m in moves)
+
+class PUCT(UCB1):
+    """ PUCT: c.wins/c.visits + c * P(c) * sqrt(self.visits)/(1 + c.visits), where P
+        comes from priors(state, moves) -> {move: probability}.
+    """
+    def __init__(self, c = 1.0, priors = uniformni_priori):
+        self.c = c
+        self.priors = priors
+
+    def Priors(self, state, moves):
+        if moves == []:
+            return None
+        return self.priors(state, moves)
+
+    def Score(self, parent, child):
+        return float(child.wins)/child.visits + self.c*child.prior*sqrt(parent.visits)/(1+child.visits)
+
+    def __repr__(self):
+        return "PUCT(c=" + str(self.c) + ")"
 
 
-###Koristimo Node2 i UCT2 kod provjere UCT_vs_UCT s razlicitim koeficijentima
-###treba promijeniti koeficijent u UCTSelectChild ispred sqrt
-    
-def UCT2(rootstate, itermax, verbose = False, brojac=-1):
-    """ Conduct a UCT search for itermax iterations starting from rootstate.
-        Return the best move from the rootstate.
-        Assumes 2 alternating players (player 1 starts), with game results in the range [0.0, 1.0]."""
-
-    rootnode = Node2(state = rootstate)
-    pobjednik = rootstate.pobjednik
-    for i in range(itermax):
-        node = rootnode
-        state = rootstate.Clone()
-        j = brojac
-        j=brojac
-        # Select
-        while node.untriedMoves == [] and node.childNodes != []: # node is fully expanded and non-terminal
-            node = node.UCTSelectChild()
-            #print state.print1()+" "+str(node.move)+" select"
-            state.DoMove(node.move)
-            j+=1            
-
-        # Expand
-        if node.untriedMoves != []: # if we can expand (i.e. state/node is non-terminal)
-            m = random.choice(node.untriedMoves)
-            #print state.print1()+" "+str(node.move)+" expand "+str(j)
-            state.DoMove(m)
-            j+=1
-            node = node.AddChild(m,state) # add child and descend tree
-            
-            
-        
-        # Rollout - this can often be made orders of magnitude quicker using a state.GetRandomMove() function
-        while state.GetMoves() != []: # while state is non-terminal
-            izbacujem_kartu = random.choice(state.GetMoves())
-            #print state.print1()+str(node.move)+" rollout"
-            state.DoMove(izbacujem_kartu)
-            j+=1
-
-            
-        # Backpropagate
-        while node != None: # backpropagate from the expanded node and work back to the root node
-            #print str(node.player_na_potezu)+" je prosao s "+str(state.GetResult(node.player_na_potezu))
-            if(node.parentNode!=None):
-                node.Update(state.GetResult(node.parentNode.player_na_potezu)) # state is terminal. Update node with result from POV of node.player_na_potezu
-            else:
-                node.Update(state.GetResult(1))
-            node = node.parentNode
-            
-        #print "na kraju iteracije j je "+str(j)
-       
-    if (verbose==False): print rootnode.TreeToString(0)
-    #else: print rootnode.ChildrenToString()
-    
-    
-    # Output some information about the tree - can be omitted
-    #print "prosli smo"+str(j)
-    
-
-    return sorted(rootnode.childNodes, key = lambda c: c.visits)[-1].move # return the move that was most visited
-
-
-
-             
+###Politike rollouta. Rollout(state) odigra state i vraca objekt s GetResult(playerjm).
+###Slucajne poteze biraju iz state.rng, a UCTEngine klonu stanja postavi svoj rng.
+
+class RandomRollout:
+    """ Play uniformly random moves until the result is decided (see odluceno).
+    """
+    def Rollout(self, state):
+        while state.GetMoves() != [] and not odluceno(state): # while state is non-terminal
+            state.DoMove(state.rng.choice(state.GetMoves()))
+        return state
+
+    def __repr__(self):
+        return "RandomRollout()"
+
+
+class ProcijenjenoStanje:
+    """ Result of a truncated rollout: vrijednost is the estimate for player 1's team.
+    """
+    def __init__(self, vrijednost):
+        self.vrijednost = vrijednost
+
+    def GetResult(self, playerjm):
+        if (playerjm - 1)%2 == 0:
+            return self.vrijednost
+        return 1 - self.vrijednost
+
+class SkraceniRollout(RandomRollout):
+    """ Play random moves for at most k whole tricks, then score the position with a static
+        evaluator (procjena.StatickaProcjena by default) instead of playing to the end.
+    """
+    def __init__(self, k = 3, procjena = None):
+        if procjena == None:
+            from procjena import StatickaProcjena
+            procjena = StatickaProcjena()
+        self.k = k
+        self.procjena = procjena
+
+    def Rollout(self, state):
+        stihova = 0
+        while state.GetMoves() != [] and not odluceno(state):
+            if stihova >= self.k and state.broj_karti_na_stolu == 0:
+                return ProcijenjenoStanje(self.procjena.Vrijednost(state))
+            state.DoMove(state.rng.choice(state.GetMoves()))
+            if state.broj_karti_na_stolu == 0:
+                stihova += 1
+        return state
+
+    def __repr__(self):
+        return "SkraceniRollout(k=" + str(self.k) + ", " + str(self.procjena) + ")"
+
+
+class UCTEngine:
+    """ UCT search with a pluggable selection and rollout policy. Engines do not share
+        any state, so differently configured bots can play in the same process.
+        With max_cvorova the tree is kept under a node budget: when it is reached the
+        lowest-visit subtrees are cut off (rezanje = True) until only udio_nakon_rezanja of
+        the budget is used, or the tree simply stops growing (rezanje = False). The budget
+        must be at least 2 (the root and one child), so BestMove always has a move to pick.
+        After a search self.statistika holds how many iterations were done, how big the
+        tree is and how much of it was cut.
+        A cache (e.g. UCT_cache.PozicijskiCache) is asked for cache.Move(rootstate) before
+        searching, and a move it knows is played without a search.
+        All the randomness of the search (expansion, rollouts, cards dealt in simulations)
+        comes from rng, e.g. random.Random(seed) or nezavisni_tok(seed, i); the default is
+        a new unseeded random.Random().
+    """
+    def __init__(self, selekcija = None, rollout = None, verbose = True, max_cvorova = None, rezanje = True, udio_nakon_rezanja = 0.75, cache = None, rng = None):
+        if max_cvorova != None and max_cvorova < 2:
+            raise ValueError("max_cvorova mora biti barem 2, a ne " + str(max_cvorova))
+        self.selekcija = selekcija or UCB1()
+        self.rollout = rollout or RandomRollout()
+        self.verbose = verbose
+        self.max_cvorova = max_cvorova
+        self.rezanje = rezanje
+        self.udio_nakon_rezanja = udio_nakon_rezanja
+        self.cache = cache
+        self.rng = rng or random.Random()
+        self.rootnode = None
+        self.broj_cvorova = 0
+        self.statistika = {}
+
+    def NewRoot(self, rootstate):
+        """ Start a new tree for rootstate.
+        """
+        self.rootnode = Node(state = rootstate, priors = self.selekcija.Priors(rootstate, rootstate.GetMoves()))
+        self.broj_cvorova = 1
+        self.statistika = {"iteracije": 0, "cvorova": 1, "max_cvorova": self.max_cvorova,
+                           "rezanja": 0, "odrezano_cvorova": 0, "neprosireno": 0, "iz_cachea": False}
+
+    def Iterate(self, rootstate, itermax):
+        """ Run itermax more iterations on the current tree, rootstate must be the state
+            the tree was started from.
+        """
+        rootnode = self.rootnode
+        for i in range(itermax):
+            if self.rezanje and not self.ImaMjesta():
+                self.Prune(int(self.max_cvorova*self.udio_nakon_rezanja))
+            node = rootnode
+            state = rootstate.Clone()
+            state.rng = self.rng
+
+            # Select
+            while node.untriedMoves == [] and node.childNodes != []: # node is fully expanded and non-terminal
+                node = self.selekcija.SelectChild(node)
+                state.DoMove(node.move)
+
+            # Expand
+            if node.untriedMoves != [] and self.ImaMjesta(): # if we can expand (i.e. state/node is non-terminal)
+                m = self.rng.choice(node.untriedMoves)
+                state.DoMove(m)
+                node = node.AddChild(m, state, self.selekcija.Priors(state, state.GetMoves())) # add child and descend tree
+                self.broj_cvorova += 1
+            elif node.untriedMoves != []:
+                self.statistika["neprosireno"] += 1
+
+            # Rollout
+            rezultat = self.rollout.Rollout(state)
+
+            # Backpropagate
+            while node != None: # backpropagate from the expanded node and work back to the root node
+                if(node.parentNode!=None):
+                    node.Update(rezultat.GetResult(node.parentNode.player_na_potezu)) # Update node with result from POV of the player who chose it
+                else:
+                    node.Update(rezultat.GetResult(1))
+                node = node.parentNode
+        self.statistika["iteracije"] += itermax
+        self.statistika["cvorova"] = self.broj_cvorova
+
+    def ImaMjesta(self):
+        """ Can the tree get one more node without going over the budget?
+        """
+        return self.max_cvorova == None or self.broj_cvorova < self.max_cvorova
+
+    def Prune(self, cilj):
+        """ Cut the subtrees with the fewest visits until at most cilj nodes are left.
+            A cut child's move goes back to its parent's untriedMoves, so it can be expanded
+            again later. Root children are never cut, the final move is chosen among them.
+        """
+        kandidati = []
+        stog = [c for c in self.rootnode.childNodes]
+        while stog != []:
+            n = stog.pop()
+            kandidati.append(n)
+            stog.extend(n.childNodes)
+        kandidati = [n for n in kandidati if n.parentNode is not self.rootnode]
+        kandidati.sort(key = lambda n: n.visits)
+        odrezano = 0
+        for n in kandidati:
+            if self.broj_cvorova <= cilj:
+                break
+            if n.parentNode == None:
+                continue # vec je odrezan s nekim pretkom
+            n.parentNode.childNodes.remove(n)
+            n.parentNode.untriedMoves.append(n.move)
+            velicina = 0
+            stog = [n]
+            while stog != []:
+                m = stog.pop()
+                m.parentNode = None
+                velicina += 1
+                stog.extend(m.childNodes)
+            self.broj_cvorova -= velicina
+            odrezano += velicina
+        self.statistika["rezanja"] += 1
+        self.statistika["odrezano_cvorova"] += odrezano
+        self.statistika["cvorova"] = self.broj_cvorova
+
+    def Reroot(self, move):
+        """ Keep only the subtree below the root child for move and make it the new root,
+            so a search from the position after move can go on from what is already known.
+            Return False (and drop the tree) if that child was never expanded.
+        """
+        dijete = None
+        if self.rootnode != None:
+            for c in self.rootnode.childNodes:
+                if c.move == move:
+                    dijete = c
+        if dijete == None or (dijete.childNodes == [] and dijete.untriedMoves == []):
+            self.rootnode = None
+            self.broj_cvorova = 0
+            return False
+        dijete.parentNode = None
+        self.rootnode = dijete
+        self.broj_cvorova = 0
+        stog = [dijete]
+        while stog != []:
+            n = stog.pop()
+            self.broj_cvorova += 1
+            stog.extend(n.childNodes)
+        self.statistika["cvorova"] = self.broj_cvorova
+        return True
+
+    def BestMove(self):
+        return sorted(self.rootnode.childNodes, key = lambda c: c.visits)[-1].move # return the move that was most visited
+
+    def Search(self, rootstate, itermax, brojac = -1):
+        """ Conduct a UCT search for itermax iterations starting from rootstate.
+            Return the best move from the rootstate.
+            Assumes 2 alternating players (player 1 starts), with game results in the range [0.0, 1.0]."""
+
+        self.NewRoot(rootstate)
+        if self.cache != None:
+            potez = self.cache.Move(rootstate)
+            if potez != None:
+                self.statistika["iz_cachea"] = True
+                return potez
+        self.Iterate(rootstate, itermax)
+
+        if (self.verbose==False): print self.rootnode.TreeToString(0)
+
+        return self.BestMove()
+
+    def __repr__(self):
+        return "UCTEngine(" + str(self.selekcija) + ", " + str(self.rollout) + ")"
+
+
+def UCT(rootstate, itermax, verbose = False, brojac=-1, selekcija = None, rollout = None, rng = None):
+    """ Conduct a UCT search for itermax iterations starting from rootstate with a
+        one-off UCTEngine. Without a selekcija this is plain UCB1 with UCTK = sqrt(2).
+    """
+    return UCTEngine(selekcija = selekcija, rollout = rollout, verbose = verbose, rng = rng).Search(rootstate, itermax, brojac)
@@ -0,0 +1,147 @@
+from math import sqrt
+
+from UCT_briskula import *
+
+###Raspodjela iteracija UCT-a kroz cijelu igru. Umjesto fiksnog broja iteracija po
+###potezu, igrac ima budzet za cijelu igru (npr. 60000 iteracija, koliko je prije
+###trosio s 5000 kad igra prvi i 1000 kad igra drugi) koji dijeli na preostale odluke:
+###  - prisilan potez (jedna karta u ruci) ili vec odlucena igra ne trose nista, a kad
+###    budzeta nestane, igra se slucajna karta,
+###  - vise bodova na stolu i u ruci = veci cilj za taj potez,
+###  - pretraga ide u koracima i staje cim je najbolji potez jasno odvojen (ili ga
+###    ostatak cilja vise ne moze prestici), a ako su dva najbolja poteza blizu nakon
+###    cilja, pretraga se produzi dok ima budzeta.
+###Izvjestaj() pokazuje kako je budzet potrosen.
+###Budzet je u iteracijama, a ne u sekundama: ista igra s istim seedom potrosi isto i
+###odigra iste poteze na svakom racunalu (simulacija.py, samoigra), a vrijeme se od
+###iteracija dobije mjerenjem koliko ih racunalo napravi u sekundi.
+
+POENI = [0, 0, 0, 0, 0, 2, 3, 4, 10, 11]   #isto kao briskula.poeni, po karta%10
+
+def preostale_odluke(state):
+    """ How many more moves the player to move will make this game, this one included.
+    """
+    za_dijeliti = 0
+    if len(state.karte) > 0:
+        za_dijeliti = len(state.karte) + 1     #i briskula, ona se dijeli zadnja
+    return len(state.karte_igraca[state.player_na_potezu - 1]) + za_dijeliti/state.players
+
+def ulog(state):
+    """ Points at stake in this move: the cards on the table and my most valuable card.
+    """
+    stol = [state.izasle[-j] for j in range(1, state.broj_karti_na_stolu + 1)]
+    ruka = state.karte_igraca[state.player_na_potezu - 1]
+    return sum(POENI[k%10] for k in stol) + max(POENI[k%10] for k in ruka)
+
+def dva_najbolja(rootnode):
+    """ The two most visited root children (the second is None if there is only one).
+    """
+    djeca = sorted(rootnode.childNodes, key = lambda c: -c.visits)
+    if len(djeca) < 2:
+        return djeca[0], None
+    return djeca[0], djeca[1]
+
+
+class BudzetIgre:
+    """ Spreads ukupno UCT iterations over one player's moves in a game. Make one per game
+        and get every move with Potez(engine, state).
+        korak is how many iterations are done between two looks at the root, the search
+        stops early once the best move's win rate is z standard errors above the second's,
+        and a move never gets more than max_udio of what is left of the budget.
+        The budget counts iterations, not seconds, so that a seeded game spends the same
+        and plays the same moves on any machine; for a time allowance multiply it by the
+        iterations per second the machine does.
+    """
+    def __init__(self, ukupno = 60000, korak = 250, z = 2.5, blizu = 0.03, max_udio = 0.5, max_ulog = 22.0):
+        self.ukupno = ukupno
+        self.korak = korak
+        self.z = z
+        self.blizu = blizu
+        self.max_udio = max_udio
+        self.max_ulog = max_ulog
+        self.potroseno = 0
+        self.potezi = []        #(redni broj odluke, ulog, cilj, iteracije, razlog) za svaki potez
+
+    def Preostalo(self):
+        return self.ukupno - self.potroseno
+
+    def Cilj(self, state):
+        """ Nominal iterations for this move: an even share of what is left, scaled up to
+            twice that by the points at stake.
+        """
+        osnovica = self.Preostalo()/float(preostale_odluke(state))
+        faktor = 1.0 + min(1.0, ulog(state)/self.max_ulog)
+        return int(min(osnovica*faktor, self.Preostalo()*self.max_udio))
+
+    def Odvojen(self, prvi, drugi):
+        """ Is the best root child clearly better than the second one?
+        """
+        if drugi == None:
+            return True
+        if prvi.visits == 0 or drugi.visits == 0:
+            return False
+        p1 = prvi.wins/float(prvi.visits)
+        p2 = drugi.wins/float(drugi.visits)
+        greska = sqrt(0.25/prvi.visits + 0.25/drugi.visits)     #rezultati su u [0, 1], varijanca je najvise 1/4
+        return p1 - p2 > self.z*greska
+
+    def Blizu(self, prvi, drugi):
+        if drugi == None or prvi.visits == 0 or drugi.visits == 0:
+            return False
+        return abs(prvi.wins/float(prvi.visits) - drugi.wins/float(drugi.visits)) < self.blizu
+
+    def Potez(self, engine, state):
+        """ Search state with engine within the budget and return the chosen move.
+        """
+        moves = state.GetMoves()
+        odluka = len(self.potezi) + 1
+        if len(moves) == 1:
+            self.potezi.append((odluka, 0, 0, 0, "prisilan"))
+            return moves[0]
+        if odluceno(state):
+            self.potezi.append((odluka, 0, 0, 0, "odluceno"))
+            return engine.rng.choice(moves)
+        if self.Preostalo() <= 0:
+            self.potezi.append((odluka, ulog(state), 0, 0, "nema budzeta"))
+            return engine.rng.choice(moves)
+        cilj = self.Cilj(state)
+        granica = max(1, int(min(2*cilj, self.Preostalo()*self.max_udio)))     #koliko smije ako su potezi blizu, nikad vise od preostalog
+        engine.NewRoot(state)
+        iteracije = 0
+        razlog = "cilj"
+        while True:
+            korak = min(self.korak, granica - iteracije)       #iteracije < granica, pa je korak barem 1
+            engine.Iterate(state, korak)
+            iteracije += korak
+            prvi, drugi = dva_najbolja(engine.rootnode)
+            if self.Odvojen(prvi, drugi):
+                razlog = "odvojeno"
+                break
+            if iteracije < cilj:
+                if drugi != None and prvi.visits - drugi.visits > cilj - iteracije:
+                    razlog = "nepromjenjivo"    #ni svih preostalih iteracija drugi ne bi stigao prvog
+                    break
+                continue
+            if iteracije >= granica or not self.Blizu(prvi, drugi):
+                if iteracije > cilj:
+                    razlog = "produzeno"
+                break
+        self.potroseno += iteracije
+        self.potezi.append((odluka, ulog(state), cilj, iteracije, razlog))
+        return engine.BestMove()
+
+    def Izvjestaj(self, detaljno = True):
+        """ How the budget was used: totals per reason and (if detaljno) one line per move.
+        """
+        redovi = ["Budzet: " + str(self.ukupno) + ", potroseno: " + str(self.potroseno) +
+                  " (%.1f%%)" % (100.0*self.potroseno/max(1, self.ukupno))]
+        razlozi = {}
+        for p in self.potezi:
+            broj, iteracije = razlozi.get(p[4], (0, 0))
+            razlozi[p[4]] = (broj + 1, iteracije + p[3])
+        for razlog in sorted(razlozi):
+            redovi.append("    %-14s %3d poteza, %7d iteracija" % ((razlog,) + razlozi[razlog]))
+        if detaljno:
+            for p in self.potezi:
+                redovi.append("    %2d. ulog %2d, cilj %6d, potroseno %6d, %s" % p)
+        return "\n".join(redovi)
@@ -0,0 +1,193 @@
+import os
+import mmap
+import struct
+import random
+import itertools
+
+from Briskula_klasa_za_UCT_vs_UCT import *
+from UCT_briskula import *
+
+###Cache odluka za pocetne pozicije (prvi krug: 3 karte u ruci, briskula, na stolu nista
+###ili samo protivnikova karta), samo za igru dvoje igraca. Boje koje nisu briskula su
+###medusobno zamjenjive, pa ih normaliziramo i tako puno pozicija dijeli isti zapis.
+###Datoteka je hash tablica s otvorenim adresiranjem (linear probing) koja se cita preko
+###mmap-a, a svaki zapis cuva broj posjeta korijenske djece iz UCT pretrage.
+
+ZAGLAVLJE = struct.Struct("<4sIII")     #oznaka, verzija, kapacitet, broj zapisa
+ZAPIS = struct.Struct("<Q3II")          #kljuc+1 (0 = prazno), posjete za 3 karte, broj pretraga
+OZNAKA = "BRKC"
+VERZIJA = 1
+NEMA_KARTE = 40
+
+def kanonski_kljuc(state):
+    """ Return (kljuc, mjesta) for an opening position of the player to move, or None.
+        kljuc is an int that is the same for all positions that differ only by a permutation
+        of the non-trump suits, mjesta[i] is the slot of hand card i in the cached visits.
+        kljuc is made of what the player sees: the hand, the trump and the card on the table,
+        so it stands for an information set, not for one position. The opponent's hand is
+        left out on purpose although the search (on a Clone) plays against the real one:
+        Put adds up the visits of searches of different deals with the same key, and a
+        cached move is the best on average over the opponent hands searched, which is
+        all a player who cannot see them can know.
+        Only two-player games have a key: with four players there can be up to three cards
+        on the table and the key keeps only one, so those positions are not cached.
+    """
+    igrac = state.player_na_potezu - 1
+    ruka = state.karte_igraca[igrac]
+    if state.players != 2 or len(state.izasle) >= state.players or len(ruka) != 3:
+        return None
+    briskula = state.briskula/10
+    ostale = [b for b in range(4) if b != briskula]
+    najbolji = None
+    for permutacija in itertools.permutations([1, 2, 3]):
+        boje = {briskula: 0}
+        for b, nova in zip(ostale, permutacija):
+            boje[b] = nova
+        karte = [boje[k/10]*10 + k%10 for k in ruka]
+        stol = NEMA_KARTE
+        if state.izasle != []:
+            stol = boje[state.izasle[-1]/10]*10 + state.izasle[-1]%10
+        kandidat = (sorted(karte), stol, karte)
+        if najbolji == None or kandidat[:2] < najbolji[:2]:
+            najbolji = kandidat
+    poredane, stol, karte = najbolji
+    maska = 0
+    for k in poredane:
+        maska |= 1 << k
+    kljuc = maska | ((state.briskula%10) << 40) | (stol << 44)
+    return kljuc, [poredane.index(k) for k in karte]
+
+
+class PozicijskiCache:
+    """ On-disk, memory-mapped cache of root visit distributions for opening positions.
+        Move(state) gives the cached decision once an entry has at least min_posjeta visits,
+        Put(state, posjete) stores (adds to) the visits of a search, e.g. from osvjezi().
+    """
+    def __init__(self, datoteka, kapacitet = 1 << 16, min_posjeta = 5000):
+        self.datoteka = datoteka
+        self.min_posjeta = min_posjeta
+        if not os.path.exists(datoteka):
+            with open(datoteka, "wb") as f:
+                f.write(ZAGLAVLJE.pack(OZNAKA, VERZIJA, kapacitet, 0))
+                f.write("\0"*(kapacitet*ZAPIS.size))
+        self.f = open(datoteka, "r+b")
+        self.mm = mmap.mmap(self.f.fileno(), 0)
+        oznaka, verzija, self.kapacitet, self.broj = ZAGLAVLJE.unpack_from(self.mm, 0)
+        if oznaka != OZNAKA or verzija != VERZIJA:
+            self.Close()
+            raise ValueError(datoteka + " nije cache pozicija")
+
+    def Trazi(self, kljuc):
+        """ Offset of the record for kljuc, or of the empty slot where it belongs.
+        """
+        i = ((kljuc*0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) % self.kapacitet
+        while True:
+            pomak = ZAGLAVLJE.size + i*ZAPIS.size
+            spremljeni = struct.unpack_from("<Q", self.mm, pomak)[0]
+            if spremljeni == 0 or spremljeni == kljuc + 1:
+                return pomak
+            i = (i + 1) % self.kapacitet
+
+    def Get(self, state):
+        """ Cached visits per move index of state, or None.
+        """
+        k = kanonski_kljuc(state)
+        if k == None:
+            return None
+        kljuc, mjesta = k
+        zapis = ZAPIS.unpack_from(self.mm, self.Trazi(kljuc))
+        if zapis[0] == 0:
+            return None
+        return [zapis[1 + m] for m in mjesta]
+
+    def Move(self, state):
+        """ The most visited cached move for state, or None if the entry is missing or thin.
+        """
+        posjete = self.Get(state)
+        if posjete == None or sum(posjete) < self.min_posjeta:
+            return None
+        return posjete.index(max(posjete))
+
+    def Put(self, state, posjete, zamijeni = False):
+        """ Add (or with zamijeni replace) the visits per move index of one search of state.
+        """
+        k = kanonski_kljuc(state)
+        if k == None:
+            return False
+        kljuc, mjesta = k
+        if (self.broj + 1)*10 > self.kapacitet*7:
+            self.Grow()
+        pomak = self.Trazi(kljuc)
+        zapis = list(ZAPIS.unpack_from(self.mm, pomak))
+        if zapis[0] == 0:
+            zapis = [kljuc + 1, 0, 0, 0, 0]
+            self.broj += 1
+            ZAGLAVLJE.pack_into(self.mm, 0, OZNAKA, VERZIJA, self.kapacitet, self.broj)
+        if zamijeni:
+            zapis[1:4] = [0, 0, 0]
+            zapis[4] = 0
+        for i, m in enumerate(mjesta):
+            zapis[1 + m] = min(0xFFFFFFFF, zapis[1 + m] + posjete[i])
+        zapis[4] += 1
+        ZAPIS.pack_into(self.mm, pomak, *zapis)
+        return True
+
+    def Grow(self):
+        """ Double the table and rehash every record.
+        """
+        zapisi = []
+        for i in range(self.kapacitet):
+            zapis = ZAPIS.unpack_from(self.mm, ZAGLAVLJE.size + i*ZAPIS.size)
+            if zapis[0] != 0:
+                zapisi.append(zapis)
+        self.mm.close()
+        self.kapacitet *= 2
+        self.f.seek(0)
+        self.f.write(ZAGLAVLJE.pack(OZNAKA, VERZIJA, self.kapacitet, len(zapisi)))
+        self.f.write("\0"*(self.kapacitet*ZAPIS.size))
+        self.f.truncate()
+        self.f.flush()
+        self.mm = mmap.mmap(self.f.fileno(), 0)
+        for zapis in zapisi:
+            ZAPIS.pack_into(self.mm, self.Trazi(zapis[0] - 1), *zapis)
+
+    def Close(self):
+        self.mm.flush()
+        self.mm.close()
+        self.f.close()
+
+    def __len__(self):
+        return self.broj
+
+
+def osvjezi(cache, broj_pozicija, itermax = 5000, engine = None, zamijeni = False, verbose = False, seed = None):
+    """ Refresh the cache with offline self-play: deal random games and search the opening
+        position of the first player and (after its move) of the second player.
+        The deals and searches are taken from seed.
+    """
+    engine = engine or UCTEngine(rng = nezavisni_tok(seed, 0))
+    for i in range(broj_pozicija):
+        b = briskula(rng = nezavisni_tok(seed, i + 1))
+        b.podjeli_karte_na_pocetku(0)
+        b.podjeli_karte_na_pocetku(1)
+        b.postavi_briskulu()
+        for j in range(b.players):
+            potez = engine.Search(b, itermax)
+            posjete = [0]*len(b.GetMoves())
+            for c in engine.rootnode.childNodes:
+                posjete[c.move] = c.visits
+            cache.Put(b, posjete, zamijeni)
+            b.DoMove(potez)
+        if verbose:
+            print str(i + 1) + "/" + str(broj_pozicija) + " dijeljenja, u cacheu je " + str(len(cache)) + " pozicija"
+
+
+if __name__ == '__main__':
+    datoteka = raw_input("Datoteka cachea? ")
+    broj = input("Koliko dijeljenja odigrati? ")
+    itermax = input("Koliko iteracija po poziciji? ")
+    cache = PozicijskiCache(datoteka)
+    try:
+        osvjezi(cache, broj, itermax, verbose = True)
+    finally:
+        cache.Close()
@@ -0,0 +1,118 @@
+import multiprocessing
+from math import sqrt
+
+from Briskula_klasa_za_UCT_vs_UCT import *
+from UCT_briskula import *
+
+###Trazi najbolji UCB1 koeficijent i podjelu iteracija (koliko od ukupnog broja iteracija
+###po krugu dobije potez kad UCT igra prvi, a koliko kad igra drugi).
+###Svaki kandidat igra parove partija protiv baze: isto dijeljenje karata, jednom sjedi
+###na mjestu igraca 2, jednom na mjestu igraca 1. Partije se igraju paralelno u procesima,
+###a kandidati se izbacuju "successive halving" banditom: nakon svake runde ostaje bolja polovica.
+
+class Postavke:
+    """ One engine configuration: UCB1 coefficient c, the total iterations per trick and
+        the share of them spent when the engine plays first in the trick.
+    """
+    def __init__(self, c = sqrt(2), ukupno = 6000, udio = 5.0/6):
+        self.c = c
+        self.ukupno = ukupno
+        self.udio = udio
+
+    def iteracije(self, igram_prvi):
+        prvi = max(1, int(round(self.ukupno*self.udio)))
+        if igram_prvi:
+            return prvi
+        return max(1, self.ukupno - prvi)
+
+    def __repr__(self):
+        return "c=%.3f, %d/%d" % (self.c, self.iteracije(True), self.iteracije(False))
+
+
+def odigraj_partiju(seed, postavke1, postavke0):
+    """ Play one game, postavke1 is player 2 (index 1) and postavke0 is player 1.
+        The deal depends only on seed, so the same seed with swapped seats is a fair pair.
+        Every engine has its own random stream, so the game does not depend on which worker
+        plays it or what it played before. Return the points [player 1, player 2].
+    """
+    b = briskula(rng = nezavisni_tok(seed, 0))     #karte iz spila se dijele iz posebnog niza random brojeva
+    b.podjeli_karte_na_pocetku(0)
+    b.podjeli_karte_na_pocetku(1)
+    b.postavi_briskulu()
+    uct = {1: UCTEngine(selekcija = UCB1(postavke1.c), rng = nezavisni_tok(seed, 1)),
+           0: UCTEngine(selekcija = UCB1(postavke0.c), rng = nezavisni_tok(seed, 2))}
+    postavke = {1: postavke1, 0: postavke0}
+    while len(b.karte_igraca[0]) + len(b.karte_igraca[1]) > 0:
+        igrac = b.player_na_potezu - 1
+        b.DoMove(uct[igrac].Search(b, postavke[igrac].iteracije(b.broj_karti_na_stolu == 0)))
+    return b.bodovi
+
+def par_partija(zadatak):
+    """ Worker: play both seats of one deal and return the candidate's average result (0..1).
+    """
+    seed, kandidat, baza = zadatak
+    rezultat = 0.0
+    bodovi = odigraj_partiju(seed, kandidat, baza)
+    rezultat += 1 if bodovi[1] > 60 else 0.5 if bodovi[1] == 60 else 0
+    bodovi = odigraj_partiju(seed, baza, kandidat)
+    rezultat += 1 if bodovi[0] > 60 else 0.5 if bodovi[0] == 60 else 0
+    return rezultat/2
+
+
+def interval(rezultati, z = 1.96):
+    """ Mean of paired results with a normal-approximation confidence interval.
+    """
+    n = len(rezultati)
+    prosjek = sum(rezultati)/n
+    if n < 2:
+        return prosjek, 0.0, 1.0
+    varijanca = sum((r - prosjek)**2 for r in rezultati)/(n - 1)
+    d = z*sqrt(varijanca/n)
+    return prosjek, max(0.0, prosjek - d), min(1.0, prosjek + d)
+
+def podesi(koeficijenti, udjeli, baza = None, ukupno = 6000, parova_po_rundi = 8, procesi = None, seed = 0, verbose = True):
+    """ Grid over koeficijenti x udjeli, pruned by successive halving.
+        Every round each surviving candidate plays parova_po_rundi paired games against baza
+        in a pool of worker processes, then the worse half is dropped.
+        Return [(postavke, prosjek, donja, gornja, broj parova)] sorted best first.
+    """
+    baza = baza or Postavke(ukupno = ukupno)
+    kandidati = [Postavke(c, ukupno, u) for c in koeficijenti for u in udjeli]
+    rezultati = dict((i, []) for i in range(len(kandidati)))
+    zivi = range(len(kandidati))
+    pool = multiprocessing.Pool(procesi)
+    runda = 0
+    try:
+        while True:
+            #svi kandidati u rundi igraju ista dijeljenja, pa je usporedba uparena
+            seedovi = [seed + runda*parova_po_rundi + j for j in range(parova_po_rundi)]
+            zadaci = [(s, kandidati[i], baza) for i in zivi for s in seedovi]
+            ishodi = pool.map(par_partija, zadaci)
+            for k, i in enumerate(zivi):
+                rezultati[i].extend(ishodi[k*parova_po_rundi:(k+1)*parova_po_rundi])
+            zivi.sort(key = lambda i: -interval(rezultati[i])[0])
+            if verbose:
+                print str(runda) + ". runda:"
+                for i in zivi:
+                    print "    " + str(kandidati[i]) + "  %.3f [%.3f, %.3f]" % interval(rezultati[i])
+            runda += 1
+            if len(zivi) == 1:
+                break
+            zivi = zivi[:(len(zivi) + 1)/2]
+    finally:
+        pool.close()
+        pool.join()
+    poredak = sorted(rezultati.keys(), key = lambda i: (-len(rezultati[i]), -interval(rezultati[i])[0]))
+    return [(kandidati[i],) + interval(rezultati[i]) + (len(rezultati[i]),) for i in poredak]
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    koeficijenti = input("Koje koeficijente isprobati (npr. [0.5, 1.0, 1.414, 2.0])? ")
+    udjeli = input("Koje udjele iteracija za igranje prvi (npr. [0.5, 0.66, 0.83])? ")
+    ukupno = input("Koliko iteracija po krugu? ")
+    parova = input("Koliko parova partija po kandidatu u rundi? ")
+    tablica = podesi(koeficijenti, udjeli, ukupno = ukupno, parova_po_rundi = parova)
+    najbolji = tablica[0]
+    print
+    print "Najbolje: " + str(najbolji[0]) + ", rezultat protiv baze %.3f, 95%% interval [%.3f, %.3f] iz %d parova" % najbolji[1:]
@@ -1,31 +1,43 @@
 import time
+import random
     
 from Briskula_klasa_za_UCT_vs_UCT import * 
 from UCT_briskula import *
+from zapis_igre import ZapisIgre
 
-###Unese se zeljeni broj iteracija za svaki utc, te broj rundi igranja
-###Ako se zeli mijenjati koeficijent iz MCTS treba ga promijeniti u UCT_briskula.py
-###Ako se zeli igrati UCT vs UCT s razlicitim koeficijentima treba pozvat UCT() i UCT2(),
-###     te njihove koeficijenti postaviti u UCT_briskula.py
+###Unese se zeljeni broj iteracija i UCB1 koeficijent za svaki utc, te broj rundi igranja
+###Koeficijent sqrt(2) ~ 1.414 je onaj koji UCT() koristi po defaultu
+###Ako se zeli druga politika selekcije (UCB1Tuned, PUCT) treba je dati UCTEngine-u dolje
+###Za automatsko trazenje najboljeg koeficijenta i podjele iteracija vidi UCT_tuning.py
+###Igre se mogu spremiti u datoteku (zapis_igre.py), a provjeriti s: python zapis_igre.py datoteka
+###Cijeli mec (dijeljenja i obje pretrage) ovisi samo o seedu, pa se s istim seedom ponovi
 
 broj_iteracija_UCT1 =  input("Koliko iteracija UCT1? ")
+koeficijent_UCT1 = input("Koji koeficijent UCT1? ")
 broj_iteracija_UCT0 = input("Koliko iteracija UCT0? ")
+koeficijent_UCT0 = input("Koji koeficijent UCT0? ")
 broj_igri = input("Koliko rundi igranja? ")
+datoteka_zapisa = raw_input("U koju datoteku spremati zapise igri (Enter = ne spremati)? ")
+seed = raw_input("Seed (Enter = slucajan)? ")
+seed = int(seed) if seed.strip() != "" else random.getrandbits(32)
+print "Seed: " + str(seed)
+
+UCT1 = UCTEngine(selekcija = UCB1(koeficijent_UCT1), rng = nezavisni_tok(seed, 1))
+UCT0 = UCTEngine(selekcija = UCB1(koeficijent_UCT0), rng = nezavisni_tok(seed, 2))
+seedovi_igri = nezavisni_tok(seed, 0)
 
 
 brojac = 0
 ukupno_briskula = 0
 for i in range (broj_igri):
         #print "prosa sam jedan krug"
-        b = briskula()
+        zapis = ZapisIgre(seedovi_igri.getrandbits(32))
+        b = zapis.Pocetak()     #podijeli karte i briskulu redom iz zapisa
         #print b.karte
-        b.podjeli_karte_na_pocetku(0)
-        b.podjeli_karte_na_pocetku(1)
         runde = 1
         broj_briskula = 0
         briskule=[]
         iteracija = 0
-        b.postavi_briskulu()
         while True:
                 """print "na pocetku runde ima jos karti za podjeliti:    "  + str(len(b.karte))
                 print str(runde)+  ". runda"
@@ -37,30 +49,34 @@ for i in range (broj_igri):
                         #print "prije igranja runde stanje je :"+b.print1()
                         #print "prije uct a"
                         #if verbose = True ne ispisuje nista
-                        odluka_UCT1 = UCT2(rootstate = b, itermax = broj_iteracija_UCT1, verbose = True,brojac = iteracija)
+                        odluka_UCT1 = UCT1.Search(rootstate = b, itermax = broj_iteracija_UCT1, brojac = iteracija)
                         #print "prije do move od compa"
                         if(b.je_li_briskula(b.karte_igraca[1][odluka_UCT1])):
                                 broj_briskula += 1
                                 briskule.append(b.karte_igraca[1][odluka_UCT1])
                 
                         #print str(b.karte_igraca[1]) + "  briskula je " + str(b.briskula)
+                        zapis.Potez(b, odluka_UCT1)
                         b.DoMove(odluka_UCT1)
                         iteracija+=1
                         #print "nakon do move od compa"
-                        odluka_UCT0 = UCT(rootstate = b, itermax = broj_iteracija_UCT0, verbose = True,brojac = iteracija)
+                        odluka_UCT0 = UCT0.Search(rootstate = b, itermax = broj_iteracija_UCT0, brojac = iteracija)
+                        zapis.Potez(b, odluka_UCT0)
                         b.DoMove(odluka_UCT0)
                         iteracija+=1
                         #print "nakon do move od covjeka"
 
                 else:
                         #print "prije igranja runde stanje je :"+b.print1()
-                        odluka_UCT0 = UCT(rootstate = b, itermax = broj_iteracija_UCT0, verbose = True,brojac = iteracija)
+                        odluka_UCT0 = UCT0.Search(rootstate = b, itermax = broj_iteracija_UCT0, brojac = iteracija)
+                        zapis.Potez(b, odluka_UCT0)
                         b.DoMove(odluka_UCT0)
                         iteracija+=1
-                        odluka_UCT1 = UCT2(rootstate = b, itermax = broj_iteracija_UCT1, verbose = True, brojac = iteracija)
+                        odluka_UCT1 = UCT1.Search(rootstate = b, itermax = broj_iteracija_UCT1, brojac = iteracija)
                         if(b.je_li_briskula(b.karte_igraca[1][odluka_UCT1])):
                                 broj_briskula += 1
                                 briskule.append(b.karte_igraca[1][odluka_UCT1])
+                        zapis.Potez(b, odluka_UCT1)
                         b.DoMove(odluka_UCT1)
                         iteracija+=1
                 #print "igrac 0 ima karti: " + str(len(b.karte_igraca[0]))
@@ -70,6 +86,10 @@ for i in range (broj_igri):
                         print str(i) + ":runda;    UCT0: "+str(b.bodovi[0])+", UCT1: "+str(b.bodovi[1])
                         print "UCT1 je imao:  " + str(broj_briskula) + "  briskula: " + str(briskule)
                         ukupno_briskula += broj_briskula
+                        if datoteka_zapisa != "":
+                                zapis.Kraj(b)
+                                with open(datoteka_zapisa, "ab") as f:
+                                        f.write(zapis.Zapakiraj())
                         #print "gubitnik ima "+str(b.bodovi[1-b.pobjednik])
 
                         if(b.bodovi[1]>60):
@@ -0,0 +1,162 @@
+import os
+
+import pygame
+
+###Sve slike za GUI (40 karata, poledina i slike izbornika) spakirane u dvije slike
+###(atlase), vec skalirane za visinu ekrana i spremljene na disk u direktorij atlas/
+###(nije u gitu, vidi .gitignore): neprozirne slike u JPEG bez alfa kanala, a tri
+###prozirne (PROZIRNE) u mali PNG. Kod pokretanja se ucitaju samo ta dva atlasa i
+###svaki se jednom pretvori u format ekrana (convert za JPEG, convert_alpha za PNG),
+###pa je svaki blit obicno kopiranje bez pretvaranja formata.
+###Pojedine slike su podslike (subsurface) atlasa i rade se tek kad zatrebaju.
+###Atlas se napravi sam kad ga nema ili je neka slika novija od njega, a moze se
+###napraviti i unaprijed: python atlas_karata.py
+
+VISINA_KARTE = 275              #karte su 140x275
+UDIO_EKRANA = 0.35              #karta u ruci smije zauzeti najvise toliko visine ekrana
+SIRINA_ATLASA = 2048            #najveca sirina atlasa
+PORAVNANJE = 16                 #slike pocinju na visekratniku 16, da JPEG blokovi (16x16) ne mijesaju dvije slike
+
+SLIKE = [(str(i), "karte2/slika" + str(i) + ".jpg", True) for i in range(40)] + [
+    ("opposite", "opposite1.jpg", True),        #(ime, datoteka, skalira li se s kartama)
+    ("play", "play.png", False),
+    ("next", "next.png", False),
+    ("exit", "exit.jpg", False),
+    ("winner", "winner.png", False),
+    ("loser", "loser.jpg", False),
+    ("usklicnik", "usklicnik.jpg", False)]
+PROZIRNE = ["play", "next", "winner"]           #imaju alfa kanal, ostale se crtaju bez njega
+
+def faktor_za_ekran(visina_ekrana):
+    """ Card scale for a screen visina_ekrana pixels high, never above the original size.
+    """
+    return min(1.0, UDIO_EKRANA*visina_ekrana/float(VISINA_KARTE))
+
+def datoteke_atlasa(faktor, direktorij = "atlas"):
+    """ (neprozirni atlas, prozirni atlas, indeks) for faktor.
+    """
+    ime = os.path.join(direktorij, "atlas_%d" % int(round(VISINA_KARTE*faktor)))
+    return ime + ".jpg", ime + "_prozirne.png", ime + ".txt"
+
+def poravnaj(n):
+    return (n + PORAVNANJE - 1)//PORAVNANJE*PORAVNANJE
+
+def slozi_na_police(slike, sirina):
+    """ Places (ime, x, y, w, h) for slike on shelves sirina wide: left to right, and a new
+        row when the row is full. Return (mjesta, visina).
+    """
+    mjesta = []
+    x = y = visina_reda = 0
+    for ime, slika in slike:
+        w, h = slika.get_size()
+        if x + w > sirina:
+            x, y, visina_reda = 0, poravnaj(y + visina_reda), 0
+        mjesta.append((ime, x, y, w, h))
+        x = poravnaj(x + w)
+        visina_reda = max(visina_reda, h)
+    return mjesta, max(1, y + visina_reda)
+
+def slozi(slike):
+    """ The smallest shelf packing of slike (tallest first) up to SIRINA_ATLASA wide, since
+        every pixel of the atlas is decoded and converted at startup.
+        Return (mjesta, sirina, visina).
+    """
+    slike = sorted(slike, key = lambda (ime, slika): -slika.get_height())
+    najuza = max(poravnaj(slika.get_width()) for ime, slika in slike)
+    najsira = min(SIRINA_ATLASA, sum(poravnaj(slika.get_width()) for ime, slika in slike))
+    najbolje = None
+    for sirina in range(najuza, max(najuza, najsira) + 1, PORAVNANJE):
+        mjesta, visina = slozi_na_police(slike, sirina)
+        if najbolje == None or sirina*visina < najbolje[1]*najbolje[2]:
+            najbolje = (mjesta, sirina, visina)
+    return najbolje
+
+def napravi_atlas(faktor, direktorij = "atlas"):
+    """ Load, scale and pack every image in SLIKE into the two atlases and save them with
+        their index (ime x y w h per line). Needs a display mode to be set, for convert_alpha().
+    """
+    if not os.path.isdir(direktorij):
+        os.makedirs(direktorij)
+    neprozirne, prozirne = [], []
+    for ime, datoteka, skaliraj in SLIKE:
+        slika = pygame.image.load(datoteka).convert_alpha()     #32 bita, za smoothscale; neprozirni atlas alfu odbaci
+        if skaliraj and faktor != 1.0:
+            w, h = slika.get_size()
+            slika = pygame.transform.smoothscale(slika, (int(round(w*faktor)), int(round(h*faktor))))
+        if ime in PROZIRNE:
+            prozirne.append((ime, slika))
+        else:
+            neprozirne.append((ime, slika))
+    neprozirni, prozirni, indeks = datoteke_atlasa(faktor, direktorij)
+    sva_mjesta = []
+    for slike, flags, dubina, datoteka in [(neprozirne, 0, 24, neprozirni), (prozirne, pygame.SRCALPHA, 32, prozirni)]:
+        mjesta, sirina, visina = slozi(slike)
+        atlas = pygame.Surface((sirina, visina), flags, dubina)
+        slike = dict(slike)
+        for ime, x, y, w, h in mjesta:
+            if flags:
+                atlas.blit(slike[ime], (x, y), special_flags = pygame.BLEND_RGBA_MAX)     #kopira i alfa, atlas je prazan (0, 0, 0, 0)
+            else:
+                atlas.blit(slike[ime], (x, y))
+        pygame.image.save(atlas, datoteka)
+        sva_mjesta += mjesta
+    with open(indeks, "w") as f:
+        for m in sva_mjesta:
+            f.write("%s %d %d %d %d\n" % m)
+
+def zastario(faktor, direktorij = "atlas"):
+    """ True if an atlas for faktor is missing or older than one of its images.
+    """
+    datoteke = datoteke_atlasa(faktor, direktorij)
+    if not all(os.path.exists(d) for d in datoteke):
+        return True
+    vrijeme = min(os.path.getmtime(d) for d in datoteke)
+    return any(os.path.getmtime(datoteka) > vrijeme for ime, datoteka, skaliraj in SLIKE)
+
+
+class AtlasKarata:
+    """ The card images for a screen visina_ekrana pixels high. atlas[k] is the picture of
+        card k (so it can stand in for the old list of 40 loaded images) and
+        atlas.Slika(ime) any other image from SLIKE.
+    """
+    def __init__(self, visina_ekrana, direktorij = "atlas"):
+        self.faktor = faktor_za_ekran(visina_ekrana)
+        if zastario(self.faktor, direktorij):
+            napravi_atlas(self.faktor, direktorij)
+        neprozirni, prozirni, indeks = datoteke_atlasa(self.faktor, direktorij)
+        self.neprozirni = pygame.image.load(neprozirni).convert()
+        self.prozirni = pygame.image.load(prozirni).convert_alpha()
+        self.mjesta = {}
+        with open(indeks) as f:
+            for red in f:
+                ime, x, y, w, h = red.split()
+                self.mjesta[ime] = pygame.Rect(int(x), int(y), int(w), int(h))
+        self.podslike = {}
+
+    def Slika(self, ime):
+        if ime not in self.podslike:
+            if ime in PROZIRNE:
+                self.podslike[ime] = self.prozirni.subsurface(self.mjesta[ime])
+            else:
+                self.podslike[ime] = self.neprozirni.subsurface(self.mjesta[ime])
+        return self.podslike[ime]
+
+    def Razmak(self):
+        """ Horizontal step between two cards in a hand (150 at the original size).
+        """
+        return int(round(150*self.faktor))
+
+    def __getitem__(self, karta):
+        return self.Slika(str(karta))
+
+    def __len__(self):
+        return 40
+
+
+if __name__ == '__main__':
+    pygame.init()
+    visina = pygame.display.Info().current_h
+    pygame.display.set_mode((1, 1))
+    faktor = faktor_za_ekran(visina)
+    napravi_atlas(faktor)
+    print "Atlas za visinu ekrana " + str(visina) + ": " + datoteke_atlasa(faktor)[0]
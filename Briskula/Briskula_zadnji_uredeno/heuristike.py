@@ -67,7 +67,8 @@ def izasao_as_i_trica(briska, karta):
         if(as_ in s or trica in s):
             return 2        #ako je izasao barem jedan
         return 0
-def heuristika_igraj_prvi(briska, igrac):
+def heuristika_igraj_prvi(briska, igrac, rng=None):        #rng: izvor slucajnih brojeva, inace briska.rng
+        rng = rng or briska.rng
         vj_jacih_od = []
         vj_slabijih_od = []
         liso_ne = []
@@ -125,7 +126,7 @@ def heuristika_igraj_prvi(briska, igrac):
                 
         #prvo pokusamo baciti liso_ne, neku proizvoljnu
         if len(liso_ne)!=0:
-            return liso_ne[random.randint(0, len(liso_ne)-1)]
+            return liso_ne[rng.randint(0, len(liso_ne)-1)]
         
         #ako nema liso provjerimo koliko ima liso briskula, ako je vise od jedne onda baacimo neku
         if len(liso_da)+len(ljudi_da)>1 and len(liso_da)>0:  #tu ulazim ako imam bar 2 briskule i od toga je jedna liso
@@ -139,7 +140,7 @@ def heuristika_igraj_prvi(briska, igrac):
         if(max_karta!=-1):
             return max_karta
         if(len(ljudi_ne)>0):
-            return ljudi_ne[random.randint(0, len(ljudi_ne)-1)]
+            return ljudi_ne[rng.randint(0, len(ljudi_ne)-1)]
         #ako ni to nije moguce onda bacamo liso briskulu ako je imamo
         if len(liso_da)>0:
             return liso_da[0]
@@ -155,9 +156,9 @@ def heuristika_igraj_prvi(briska, igrac):
         #ovo se ne bi nikada trebalo dogodit
         return -1
     
-def odaberi_kartu_za_bacanje(briska, koji_po_redu, igrac):
+def odaberi_kartu_za_bacanje(briska, koji_po_redu, igrac, rng=None):
         if koji_po_redu==1:
-            return heuristika_igraj_prvi(briska,igrac)
+            return heuristika_igraj_prvi(briska,igrac,rng)
         else:
             return igram_zadnji(briska,igrac)
             #return 0
@@ -1,6 +1,7 @@
 import pygame, sys          #This module provides access to some variables used or maintained by the interpreter and to
 from pygame.locals import *        #tu se QUIT nalzi...pygame.locals.konstant mozemo pisati samo konstant
 import time
+import multiprocessing
 
 from Briskula_klasa import * 
 from UCT_briskula import *
@@ -29,4 +30,6 @@ def main():
         runda+=1
 
 
-main()
+if __name__ == '__main__':      #UCT se racuna u drugom procesu koji ponovno ucitava ovaj program
+    multiprocessing.freeze_support()
+    main()
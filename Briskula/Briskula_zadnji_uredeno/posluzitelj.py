@@ -0,0 +1,132 @@
+import sys
+import json
+import time
+import random
+import threading
+import multiprocessing
+
+from Briskula_klasa_za_UCT_vs_UCT import *
+from UCT_briskula import *
+
+###Posluzitelj poteza: dugo zivi proces koji cita zahtjeve s stdin i pise odgovore na
+###stdout, jedan JSON objekt po retku. Pretrage rade procesi iz Pool-a koji su vec
+###ucitali engine i drze svoj UCTEngine, pa zahtjev ne placa pokretanje Pythona.
+###Zahtjevi se salju procesima cim stignu, a odgovori se pisu kako koja pretraga zavrsi
+###(ne nuzno redom), zato svaki odgovor nosi "id" svog zahtjeva.
+###
+###Zahtjev:  {"id": 7, "stanje": {...}, "iteracije": 5000}  ili  {..., "sekunde": 0.5}
+###          s "seed": 123 pretraga koristi random.Random(123) i moze se ponoviti
+###Odgovor:  {"id": 7, "potez": 1, "karta": 23, "statistika": {...}}
+###Greska:   {"id": 7, "greska": "..."}
+###"stanje" je stanje_u_rjecnik(b) za igru b (Briskula_klasa_za_UCT_vs_UCT.briskula).
+###Posluzitelj zavrsi kad stdin zavrsi (EOF), nakon sto odgovori na sve zahtjeve.
+
+POLJA_STANJA = ["players", "karte", "izasle", "briskula", "karte_za_bacanje", "pobjednik",
+                "bodovi", "player_na_potezu", "broj_karti_na_stolu"]
+KORAK = 100         #iteracija izmedu dvije provjere vremena kod zahtjeva sa "sekunde"
+
+def stanje_u_rjecnik(state):
+    """ The game state as a dict of JSON types.
+    """
+    d = dict((polje, getattr(state, polje)) for polje in POLJA_STANJA)
+    d["karte_igraca"] = [state.karte_igraca[i] for i in range(state.players)]
+    return d
+
+def stanje_iz_rjecnika(d):
+    state = briskula(d["players"])
+    for polje in POLJA_STANJA:
+        setattr(state, polje, d[polje])
+    state.karte_igraca = dict(enumerate(d["karte_igraca"]))
+    return state
+
+
+engine = None
+tok_radnika = None
+
+def pripremi_radnika(seed, brojac):
+    """ Pool initializer: one engine per worker, and its own random stream
+        nezavisni_tok(seed, i) for the i-th worker started (forked workers would otherwise
+        all continue the parent's stream).
+    """
+    global engine, tok_radnika
+    with brojac.get_lock():
+        brojac.value += 1
+        i = brojac.value
+    tok_radnika = nezavisni_tok(seed, i)
+    engine = UCTEngine(rng = tok_radnika)
+
+def odgovori(zahtjev):
+    """ Worker: search one request and return the response dict.
+    """
+    try:
+        state = stanje_iz_rjecnika(zahtjev["stanje"])
+        if state.GetMoves() == []:
+            raise ValueError("igra je gotova, nema poteza")
+        engine.rng = tok_radnika
+        if "seed" in zahtjev:
+            engine.rng = random.Random(zahtjev["seed"])
+        pocetak = time.time()
+        engine.NewRoot(state)
+        if "sekunde" in zahtjev:
+            kraj = pocetak + zahtjev["sekunde"]
+            while True:
+                engine.Iterate(state, KORAK)
+                if time.time() >= kraj:
+                    break
+        else:
+            engine.Iterate(state, max(1, zahtjev.get("iteracije", 5000)))
+        potez = engine.BestMove()
+        statistika = dict(engine.statistika)
+        statistika["sekunde"] = round(time.time() - pocetak, 4)
+        statistika["posjete"] = [0]*len(state.GetMoves())      #po indeksu karte u ruci
+        for c in engine.rootnode.childNodes:
+            statistika["posjete"][c.move] = c.visits
+            if c.move == potez:
+                statistika["pobjede"] = round(c.wins/float(c.visits), 4)
+        return {"id": zahtjev.get("id"), "potez": potez,
+                "karta": state.karte_igraca[state.player_na_potezu - 1][potez], "statistika": statistika}
+    except Exception, e:
+        return {"id": zahtjev.get("id"), "greska": e.__class__.__name__ + ": " + str(e)}
+
+
+class Posluzitelj:
+    """ Reads requests from ulaz and writes responses to izlaz, with procesi warm workers.
+        The workers' random streams are derived from seed (None = a random seed).
+    """
+    def __init__(self, procesi = None, ulaz = None, izlaz = None, seed = None):
+        self.pool = multiprocessing.Pool(procesi, pripremi_radnika, (seed, multiprocessing.Value("i", 0)))
+        self.ulaz = ulaz or sys.stdin
+        self.izlaz = izlaz or sys.stdout
+        self.brava = threading.Lock()       #odgovore pise i glavna dretva (greske) i dretva Pool-a
+
+    def Posalji(self, odgovor):
+        with self.brava:
+            self.izlaz.write(json.dumps(odgovor) + "\n")
+            self.izlaz.flush()
+
+    def Run(self):
+        for red in iter(self.ulaz.readline, ""):    #readline, jer "for red in sys.stdin" ceka pun buffer
+            if red.strip() == "":
+                continue
+            try:
+                zahtjev = json.loads(red)
+            except ValueError, e:
+                self.Posalji({"id": None, "greska": "neispravan JSON: " + str(e)})
+                continue
+            if not isinstance(zahtjev, dict):
+                self.Posalji({"id": None, "greska": "zahtjev mora biti JSON objekt"})
+                continue
+            self.pool.apply_async(odgovori, (zahtjev,), callback = self.Posalji)
+        self.pool.close()
+        self.pool.join()
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    procesi = None
+    seed = None
+    if len(sys.argv) > 1:
+        procesi = int(sys.argv[1])
+    if len(sys.argv) > 2:
+        seed = int(sys.argv[2])
+    Posluzitelj(procesi, seed = seed).Run()
@@ -0,0 +1,112 @@
+import signal
+import random
+import multiprocessing
+
+from UCT_briskula import *
+
+###UCT pretraga u posebnom procesu, da pygame petlja za to vrijeme moze obradivati
+###dogadaje (QUIT, crtanje). Procesu se salje Clone() stanja, jer se originalno
+###stanje s pygame slikama ne moze poslati u drugi proces.
+###Programi koji ovo koriste moraju imati "if __name__ == '__main__':" jer Windows
+###u novom procesu ponovno ucitava glavni program.
+###Dok covjek razmislja, proces i dalje pretrazuje (Ponder) trenutno stablo. Kad dode
+###nova pozicija koja je stara pozicija + jedna odigrana karta, stablo se ne baca nego
+###se korijen premjesti na dijete te karte (UCTEngine.Reroot), pa komp nakon covjekovog
+###poteza odgovara skoro odmah.
+
+KORAK_RAZMISLJANJA = 100        #iteracija izmedu dvije provjere ima li novih naredbi
+MAX_RAZMISLJANJA = 200000       #iznad toliko posjeta korijena se vise ne razmislja
+MAX_CVOROVA = 50000             #budzet cvorova stabla radnika, koji zivi cijelu igru; kad se napuni, Iterate reze (Prune)
+
+def nastavi_stablo(engine, stari, novi):
+    """ Prepare engine's tree for the search from novi and return the state to search from.
+        If novi is stari after one more card, the tree is re-rooted on that card, else a new
+        tree is started.
+    """
+    if stari != None and engine.rootnode != None and novi.briskula == stari.briskula \
+       and len(novi.izasle) == len(stari.izasle) + 1 and novi.izasle[:-1] == stari.izasle:
+        ruka = stari.karte_igraca[stari.player_na_potezu - 1]
+        if novi.izasle[-1] in ruka and engine.Reroot(ruka.index(novi.izasle[-1])):
+            return novi
+    engine.NewRoot(novi)
+    return novi
+
+def radnik(veza):
+    """ Worker process loop. Naredbe: ("razmisljaj", stanje) searches stanje until the next
+        naredba, ("trazi", stanje, itermax) searches until the root has itermax visits and
+        sends back the best move, ("kraj",) ends the process.
+    """
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)   #SDL iz roditelja SIGTERM pretvara u QUIT dogadaj, a Close() treba ugasiti proces
+    engine = UCTEngine(max_cvorova = MAX_CVOROVA, rng = random.Random())       #svoj tok, ne nastavak roditeljevog
+    stanje = None
+    razmisljam = False
+    while True:
+        if razmisljam and not veza.poll():
+            if engine.rootnode.visits < MAX_RAZMISLJANJA:
+                engine.Iterate(stanje, KORAK_RAZMISLJANJA)
+            else:
+                veza.poll(None)         #stablo je dovoljno veliko, cekamo naredbu
+            continue
+        naredba = veza.recv()
+        if naredba[0] == "razmisljaj":
+            stanje = nastavi_stablo(engine, stanje, naredba[1])
+            razmisljam = True
+        elif naredba[0] == "trazi":
+            stanje = nastavi_stablo(engine, stanje, naredba[1])
+            razmisljam = False
+            engine.Iterate(stanje, max(0, naredba[2] - engine.rootnode.visits))
+            veza.send(engine.BestMove())
+        else:
+            break
+
+
+class Rezultat:
+    """ The answer to one Start, polled with ready() and read with get().
+    """
+    def __init__(self, veza):
+        self.veza = veza
+
+    def ready(self):
+        return self.veza.poll()
+
+    def get(self):
+        return self.veza.recv()
+
+
+class PozadinskaPretraga:
+    """ One warm worker process for the GUI bot that keeps its UCT tree between moves.
+        Start returns a Rezultat the event loop polls with ready() and reads with get(),
+        Ponder lets the worker search while the human is choosing a card.
+    """
+    def __init__(self):
+        self.veza, veza_radnika = multiprocessing.Pipe()
+        self.proces = multiprocessing.Process(target = radnik, args = (veza_radnika,))
+        self.proces.daemon = True
+        self.proces.start()
+
+    def Start(self, stanje, itermax):
+        self.veza.send(("trazi", stanje.Clone(), itermax))
+        return Rezultat(self.veza)
+
+    def Ponder(self, stanje):
+        self.veza.send(("razmisljaj", stanje.Clone()))
+
+    def Close(self):
+        self.proces.terminate()
+        self.proces.join()
+
+
+if __name__ == '__main__':
+    #provjera: Start i Ponder salju radniku Clone() stanja, a on se mora moci picklati
+    import pickle
+    from Briskula_klasa_za_UCT_vs_UCT import briskula
+    b = briskula()
+    b.podjeli_karte_na_pocetku(0)
+    b.podjeli_karte_na_pocetku(1)
+    b.postavi_briskulu()
+    pickle.dumps(b.Clone())
+    pretraga = PozadinskaPretraga()
+    try:
+        print "Potez: " + str(pretraga.Start(b, 500).get())
+    finally:
+        pretraga.Close()
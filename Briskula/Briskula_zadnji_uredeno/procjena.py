@@ -0,0 +1,112 @@
+from UCT_briskula import *
+
+###Staticka procjena pozicije za skracene rolloute (UCT_briskula.SkraceniRollout).
+###Procjena je linearna: vjerojatnost da tim igraca 1 pobijedi = tezine * znacajke,
+###odrezano na [0, 1]. Znacajke se racunaju kao brojanje u heuristike.py (bodovi,
+###briskule, karte koje jos nisu vidjene), a tezine se uce iz samoigre metodom
+###najmanjih kvadrata (nauci_tezine, treba NumPy). Za milijune pozicija iz binarnih
+###zapisa samoigre vidi samoigra.nauci_procjenu.
+
+IMENA_ZNACAJKI = ["slobodni clan", "razlika bodova", "moje briskule", "protivnikove briskule",
+                  "bodovi u mojoj ruci", "bodovi u protivnikovoj ruci", "nevidjeni bodovi"]
+
+#dobivene s nauci_tezine(*skupi_podatke(300, itermax = 300)), 6000 pozicija
+ZADANE_TEZINE = [0.431, 1.444, 0.337, -0.210, 0.727, -0.635, 0.017]
+
+POENI = [0, 0, 0, 0, 0, 2, 3, 4, 10, 11]   #isto kao briskula.poeni, po karta%10
+
+def znacajke_ruku(state, igrac):
+    """ Features of state from the viewpoint of player igrac (1..players), all from the
+        current bodovi and hands, so they can also be computed from stored records.
+    """
+    tim = (igrac - 1)%2
+    moja_ruka = state.karte_igraca[igrac - 1]
+    protivnikova_ruka = []
+    for i in range(state.players):
+        if i%2 != tim:
+            protivnikova_ruka.extend(state.karte_igraca[i])
+    return znacajke(state.bodovi[tim], state.bodovi[1 - tim], moja_ruka, protivnikova_ruka,
+                    state.briskula, [state.izasle[-j] for j in range(1, state.broj_karti_na_stolu + 1)])
+
+def znacajke(moji_bodovi, protivnikovi_bodovi, moja_ruka, protivnikova_ruka, briskula, stol = []):
+    """ The evaluator inputs, scaled to about [-1, 1]: point difference, trumps held by each
+        side, points in each hand and points not seen yet from my side of the table.
+    """
+    poeni = lambda k: POENI[k%10]
+    bodovi_moji = sum(poeni(k) for k in moja_ruka)
+    bodovi_protivnika = sum(poeni(k) for k in protivnikova_ruka)
+    nevidjeni = UKUPNO_BODOVA - moji_bodovi - protivnikovi_bodovi - bodovi_moji - sum(poeni(k) for k in stol)
+    return [1.0,
+            (moji_bodovi - protivnikovi_bodovi)/float(UKUPNO_BODOVA),
+            sum(1 for k in moja_ruka if k/10 == briskula/10)/3.0,
+            sum(1 for k in protivnikova_ruka if k/10 == briskula/10)/3.0,
+            bodovi_moji/float(UKUPNO_BODOVA),
+            bodovi_protivnika/float(UKUPNO_BODOVA),
+            nevidjeni/float(UKUPNO_BODOVA)]
+
+class StatickaProcjena:
+    """ Linear evaluator: Vrijednost(state) is the estimated result for player 1's team.
+    """
+    def __init__(self, tezine = None):
+        self.tezine = tezine or ZADANE_TEZINE
+
+    def Vrijednost(self, state):
+        x = znacajke_ruku(state, 1)
+        v = sum(w*z for w, z in zip(self.tezine, x))
+        return min(1.0, max(0.0, v))
+
+    def __repr__(self):
+        return "StatickaProcjena(" + ", ".join("%.3f" % w for w in self.tezine) + ")"
+
+
+def spremi_tezine(tezine, datoteka):
+    with open(datoteka, "w") as f:
+        for ime, w in zip(IMENA_ZNACAJKI, tezine):
+            f.write(repr(w) + "    #" + ime + "\n")
+
+def ucitaj_tezine(datoteka):
+    with open(datoteka) as f:
+        return [float(red.split("#")[0]) for red in f if red.split("#")[0].strip() != ""]
+
+
+def skupi_podatke(broj_igri, itermax = 300, engine = None, verbose = False, seed = None):
+    """ Log self-play positions for fitting: at the start of every trick the features from
+        player 1's view and, once the game is over, its final result from player 1's view.
+        Return (X, y) as lists. The same seed gives the same data.
+    """
+    from Briskula_klasa_za_UCT_vs_UCT import briskula
+    engine = engine or UCTEngine(rng = nezavisni_tok(seed, 0))
+    X = []
+    y = []
+    for i in range(broj_igri):
+        b = briskula(rng = nezavisni_tok(seed, i + 1))
+        b.podjeli_karte_na_pocetku(0)
+        b.podjeli_karte_na_pocetku(1)
+        b.postavi_briskulu()
+        pozicije = []
+        while b.GetMoves() != []:
+            if b.broj_karti_na_stolu == 0:
+                pozicije.append(znacajke_ruku(b, 1))
+            b.DoMove(engine.Search(b, itermax))
+        X.extend(pozicije)
+        y.extend([b.GetResult(1)]*len(pozicije))
+        if verbose:
+            print str(i + 1) + "/" + str(broj_igri) + " igri, " + str(len(X)) + " pozicija"
+    return X, y
+
+def nauci_tezine(X, y):
+    """ Least-squares fit of the evaluator weights to logged positions (NumPy).
+    """
+    import numpy
+    tezine = numpy.linalg.lstsq(numpy.asarray(X, dtype = float), numpy.asarray(y, dtype = float), rcond = None)[0]
+    return [float(w) for w in tezine]
+
+
+if __name__ == '__main__':
+    broj_igri = input("Koliko igri samoigre? ")
+    itermax = input("Koliko iteracija po potezu? ")
+    datoteka = raw_input("U koju datoteku spremiti tezine? ")
+    tezine = nauci_tezine(*skupi_podatke(broj_igri, itermax, verbose = True))
+    for ime, w in zip(IMENA_ZNACAJKI, tezine):
+        print ime + ": %.4f" % w
+    spremi_tezine(tezine, datoteka)
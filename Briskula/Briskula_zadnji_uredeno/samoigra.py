@@ -0,0 +1,190 @@
+import os
+import glob
+
+import numpy
+
+from Briskula_klasa_za_UCT_vs_UCT import *
+from UCT_briskula import *
+import procjena
+
+###Samoigra koja sprema pozicije u binarne zapise fiksne duljine. Zapisi se pisu u
+###datoteke (blokove) od po zapisa_po_datoteci zapisa preko numpy.memmap-a, a citaju
+###se blok po blok, tako da se ni kod pisanja ni kod citanja ne drzi sve u memoriji.
+###Karte su bitmaske (bit k = karta k), a posjete korijenske djece su poredane po
+###karti igraca na potezu (najmanja karta prva), ne po indeksu u ruci.
+
+ZAPIS = numpy.dtype([
+    ("ruke", "<u8", (2,)),          #karte u ruci igraca 1 i 2
+    ("izasle", "<u8"),              #sve odigrane karte, ukljucujuci one na stolu
+    ("stol", "<u8"),                #karte na stolu u ovom krugu
+    ("briskula", "u1"),
+    ("bodovi", "u1", (2,)),         #bodovi u trenutku pozicije
+    ("na_potezu", "u1"),            #1 ili 2
+    ("posjete", "<u4", (3,)),       #posjete UCT korijena po karti na potezu
+    ("konacni_bodovi", "u1", (2,)), #bodovi na kraju igre
+])
+
+def maska(karte):
+    m = 0
+    for k in karte:
+        m |= 1 << k
+    return m
+
+def karte_iz_maske(m):
+    return [k for k in range(40) if m >> k & 1]
+
+
+class PisacZapisa:
+    """ Append records to chunk files direktorij/zapisi_00000.bin, ... of at most
+        zapisa_po_datoteci records each, written through numpy.memmap.
+    """
+    def __init__(self, direktorij, zapisa_po_datoteci = 1 << 16):
+        if not os.path.isdir(direktorij):
+            os.makedirs(direktorij)
+        self.direktorij = direktorij
+        self.zapisa_po_datoteci = zapisa_po_datoteci
+        self.blok = len(glob.glob(os.path.join(direktorij, "zapisi_*.bin")))
+        self.mm = None
+        self.n = 0
+        self.ukupno = 0
+
+    def Write(self, zapisi):
+        """ Write a numpy array (or list of tuples) of ZAPIS records.
+        """
+        zapisi = numpy.asarray(zapisi, dtype = ZAPIS)
+        i = 0
+        while i < len(zapisi):
+            if self.mm is None:
+                self.datoteka = os.path.join(self.direktorij, "zapisi_%05d.bin" % self.blok)
+                self.mm = numpy.memmap(self.datoteka, dtype = ZAPIS, mode = "w+", shape = (self.zapisa_po_datoteci,))
+                self.n = 0
+            koliko = min(len(zapisi) - i, self.zapisa_po_datoteci - self.n)
+            self.mm[self.n:self.n + koliko] = zapisi[i:i + koliko]
+            self.n += koliko
+            self.ukupno += koliko
+            i += koliko
+            if self.n == self.zapisa_po_datoteci:
+                self.ZatvoriBlok()
+
+    def ZatvoriBlok(self):
+        if self.mm is None:
+            return
+        self.mm.flush()
+        del self.mm
+        self.mm = None
+        if self.n < self.zapisa_po_datoteci:       #zadnji blok skratimo na ono sto je zapisano
+            with open(self.datoteka, "r+b") as f:
+                f.truncate(self.n*ZAPIS.itemsize)
+        self.blok += 1
+
+    def Close(self):
+        self.ZatvoriBlok()
+
+
+def citaj_zapise(direktorij):
+    """ Yield the records chunk by chunk as read-only memmaps, nothing is loaded up front.
+    """
+    for datoteka in sorted(glob.glob(os.path.join(direktorij, "zapisi_*.bin"))):
+        if os.path.getsize(datoteka) >= ZAPIS.itemsize:
+            yield numpy.memmap(datoteka, dtype = ZAPIS, mode = "r")
+
+def broj_zapisa(direktorij):
+    return sum(os.path.getsize(d)//ZAPIS.itemsize for d in glob.glob(os.path.join(direktorij, "zapisi_*.bin")))
+
+
+def zapis_pozicije(b, engine):
+    """ Record of position b with the root visits of the search engine just did from it
+        (or, if the move came from the engine's cache, the cached visits).
+    """
+    igrac = b.player_na_potezu - 1
+    ruka = b.karte_igraca[igrac]
+    if engine.statistika.get("iz_cachea"):
+        po_potezu = engine.cache.Get(b)     #nije bilo pretrage, stablo je prazno
+    else:
+        po_potezu = [0]*len(ruka)
+        for c in engine.rootnode.childNodes:
+            po_potezu[c.move] = c.visits
+    posjete = [0, 0, 0]
+    poredane = sorted(ruka)
+    for move, v in enumerate(po_potezu):
+        posjete[poredane.index(ruka[move])] = v
+    stol = [b.izasle[-j] for j in range(1, b.broj_karti_na_stolu + 1)]
+    return ((maska(b.karte_igraca[0]), maska(b.karte_igraca[1])), maska(b.izasle), maska(stol),
+            b.briskula, tuple(b.bodovi), b.player_na_potezu, tuple(posjete), (0, 0))
+
+def samoigra(broj_igri, direktorij, itermax = 1000, engine = None, zapisa_po_datoteci = 1 << 16, verbose = False, seed = None):
+    """ Play broj_igri UCT self-play games and write every position (before each move) with
+        its root visit distribution and, once the game is over, the final score.
+        With the same seed (and the default engine) the same games are played again.
+    """
+    engine = engine or UCTEngine(rng = nezavisni_tok(seed, 0))
+    pisac = PisacZapisa(direktorij, zapisa_po_datoteci)
+    try:
+        for i in range(broj_igri):
+            b = briskula(rng = nezavisni_tok(seed, i + 1))
+            b.podjeli_karte_na_pocetku(0)
+            b.podjeli_karte_na_pocetku(1)
+            b.postavi_briskulu()
+            igra = []
+            while b.GetMoves() != []:
+                potez = engine.Search(b, itermax)
+                igra.append(zapis_pozicije(b, engine))
+                b.DoMove(potez)
+            zapisi = numpy.array(igra, dtype = ZAPIS)
+            zapisi["konacni_bodovi"] = b.bodovi
+            pisac.Write(zapisi)
+            if verbose:
+                print str(i + 1) + "/" + str(broj_igri) + " igri, " + str(pisac.ukupno) + " zapisa"
+    finally:
+        pisac.Close()
+
+
+def bitovi(maske):
+    """ (n, 40) 0/1 matrix of the cards in an array of uint64 bitmasks.
+    """
+    bajtovi = numpy.ascontiguousarray(maske, dtype = "<u8").view(numpy.uint8).reshape(-1, 8)
+    return numpy.unpackbits(bajtovi, axis = 1).reshape(-1, 8, 8)[:, :, ::-1].reshape(-1, 64)[:, :40]
+
+def znacajke_zapisa(zapisi):
+    """ procjena.znacajke from player 1's view for the records that start a trick, and the
+        final result from player 1's view. Return (X, y) as NumPy arrays.
+    """
+    zapisi = zapisi[zapisi["stol"] == 0]
+    poeni = numpy.array([procjena.POENI[k%10] for k in range(40)], dtype = float)
+    boja = numpy.arange(40)//10
+    briskule = (boja[None, :] == (zapisi["briskula"]//10)[:, None])
+    moja = bitovi(zapisi["ruke"][:, 0])
+    protivnikova = bitovi(zapisi["ruke"][:, 1])
+    bodovi = zapisi["bodovi"].astype(float)
+    konacni = zapisi["konacni_bodovi"].astype(int)
+    ukupno = float(UKUPNO_BODOVA)
+    X = numpy.column_stack([
+        numpy.ones(len(zapisi)),
+        (bodovi[:, 0] - bodovi[:, 1])/ukupno,
+        (moja*briskule).sum(axis = 1)/3.0,
+        (protivnikova*briskule).sum(axis = 1)/3.0,
+        moja.dot(poeni)/ukupno,
+        protivnikova.dot(poeni)/ukupno,
+        (ukupno - bodovi.sum(axis = 1) - moja.dot(poeni))/ukupno])
+    y = numpy.where(konacni[:, 0] > konacni[:, 1], 1.0, numpy.where(konacni[:, 0] == konacni[:, 1], 0.5, 0.0))
+    return X, y
+
+def nauci_procjenu(direktorij):
+    """ Fit the procjena weights on every record in direktorij, streaming chunk by chunk
+        (the normal equations are accumulated, so memory does not grow with the data).
+    """
+    XtX = 0
+    Xty = 0
+    for zapisi in citaj_zapise(direktorij):
+        X, y = znacajke_zapisa(zapisi)
+        XtX = XtX + X.T.dot(X)
+        Xty = Xty + X.T.dot(y)
+    return [float(w) for w in numpy.linalg.lstsq(XtX, Xty, rcond = None)[0]]
+
+
+if __name__ == '__main__':
+    broj_igri = input("Koliko igri samoigre? ")
+    itermax = input("Koliko iteracija po potezu? ")
+    direktorij = raw_input("U koji direktorij spremati zapise? ")
+    samoigra(broj_igri, direktorij, itermax, verbose = True)
+    print "U " + direktorij + " je sada " + str(broj_zapisa(direktorij)) + " zapisa"
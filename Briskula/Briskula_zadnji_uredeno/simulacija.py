@@ -1,19 +1,27 @@
 import pygame, sys          #This module provides access to some variables used or maintained by the interpreter and to
 from pygame.locals import *        #tu se QUIT nalzi...pygame.locals.konstant mozemo pisati samo konstant
 import time
+import random
     
 from Briskula_klasa import * 
 from UCT_briskula import *
 from heuristike import *
+from UCT_budzet import *
 
 
+seed = random.getrandbits(32)         #s istim seedom se ponove iste igre
+print "Seed: " + str(seed)
+heuristika_rng = nezavisni_tok(seed, 1)
+uct = UCTEngine(rng = nezavisni_tok(seed, 0))     #jedan engine i tok za svih 10 igri, da svaka igra ne ponovi iste slucajne brojeve
 brojac = 0
 for i in range (10):
     #print "prosa sam jedan krug"
-    b = briskula()
+    b = briskula(rng = nezavisni_tok(seed, i + 2))
     #print b.karte
     b.podjeli_karte_na_pocetku(0)
     b.podjeli_karte_na_pocetku(1)
+    #UCT vise nema fiksno 5000 iteracija kad igra prvi i 1000 kad igra drugi, nego isto toliko za cijelu igru (UCT_budzet.py)
+    budzet = BudzetIgre(ukupno = 60000)
     runde = 1
     iteracija = 0
     b.postavi_briskulu()
@@ -28,22 +36,22 @@ for i in range (10):
             #print "prije igranja runde stanje je :"+b.print1()
             #print "prije uct a"
             #if verbose = True ne ispisuje nista
-            odluka_compa = UCT(rootstate = b, itermax = 5000, verbose = True,brojac = iteracija)
+            odluka_compa = budzet.Potez(uct, b)
             #print "prije do move od compa"
             b.DoMove(odluka_compa)
             iteracija+=1
             #print "nakon do move od compa"
-            odluka_covjeka = odaberi_kartu_za_bacanje(b,2, 0)
+            odluka_covjeka = odaberi_kartu_za_bacanje(b,2, 0, heuristika_rng)
             b.DoMove(odluka_covjeka)
             iteracija+=1
             #print "nakon do move od covjeka"
 
         else:
             #print "prije igranja runde stanje je :"+b.print1()
-            odluka_covjeka = odaberi_kartu_za_bacanje(b,1, 0)
+            odluka_covjeka = odaberi_kartu_za_bacanje(b,1, 0, heuristika_rng)
             b.DoMove(odluka_covjeka)
             iteracija+=1
-            odluka_compa = UCT(rootstate = b, itermax = 1000, verbose = True, brojac = iteracija)
+            odluka_compa = budzet.Potez(uct, b)
             b.DoMove(odluka_compa)
             iteracija+=1
         #print "igrac 0 ima karti: " + str(len(b.karte_igraca[0]))
@@ -51,6 +59,7 @@ for i in range (10):
         #time.sleep(2)
         if(len(b.karte_igraca[0])==0):
             print "Heuristika: "+str(b.bodovi[0])+", UCT: "+str(b.bodovi[1])
+            print budzet.Izvjestaj(detaljno = False)
             #print "gubitnik ima "+str(b.bodovi[1-b.pobjednik])
 
             if(b.bodovi[1]>60):
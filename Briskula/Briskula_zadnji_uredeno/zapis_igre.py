@@ -0,0 +1,173 @@
+import sys
+import struct
+import random
+
+from Briskula_klasa_za_UCT_vs_UCT import *
+
+###Kratki zapis jedne igre za arhivu i regresijske provjere. Zapis ima zaglavlje
+###(verzija, broj igraca, tko prvi igra, seed, konacni bodovi, broj poteza) i onda
+###karte po 6 bitova: redoslijed dijeljenja (svih 40 karata: pocetne ruke igrac po igrac,
+###briskula, pa karte iz spila redom kako se dijele) i odigrane karte (ne indeksi u ruci).
+###Cijela igra za dva igraca stane u 10 + 60 bajtova. Zapisi se u datoteci samo nizu
+###jedan za drugim, jer se duljina zapisa zna iz zaglavlja.
+###Igra se iz zapisa ponovi s DoMove, jer briskula s fiksno_dijeljenje = True dijeli
+###karte redom iz self.karte.
+###Redoslijed dijeljenja se sprema iako ga seed vec odreduje: dijeljenje ne mora doci iz
+###seeda (ZapisIgre(dijeljenje = ...), npr. igra iz GUI-ja), a random.shuffle ne jamci
+###isti redoslijed u svim verzijama Pythona. Zapis se zato ponovi samo iz spremljenih
+###karata, a seed je tu da se igra moze naci i ponovo odigrati istim programom.
+
+ZAGLAVLJE = struct.Struct("<BBBI2BB")     #verzija, igraca, prvi na potezu, seed, bodovi[0], bodovi[1], broj poteza
+VERZIJA = 1
+
+def zapakiraj_karte(karte):
+    """ Pack card ids (0..39) 6 bits each, the first card in the lowest bits.
+    """
+    broj = 0
+    for i, k in enumerate(karte):
+        broj |= k << (6*i)
+    duljina = (6*len(karte) + 7)/8
+    return "".join(chr(broj >> (8*i) & 0xFF) for i in range(duljina))
+
+def raspakiraj_karte(podaci, n, pomak = 0):
+    duljina = (6*n + 7)/8
+    broj = 0
+    for i, c in enumerate(podaci[pomak:pomak + duljina]):
+        broj |= ord(c) << (8*i)
+    return [int(broj >> (6*i) & 0x3F) for i in range(n)]
+
+
+class ZapisIgre:
+    """ The record of one game. For a new game ZapisIgre(seed) deals from seed (seed = None
+        picks a random 32-bit seed, which is recorded), Pocetak() gives the starting
+        position, Potez(state, move) must be called before every DoMove and Kraj(state)
+        once the game is over.
+    """
+    def __init__(self, seed = 0, igraca = 2, prvi = 2, dijeljenje = None, potezi = None, bodovi = (0, 0)):
+        if seed == None:
+            seed = random.getrandbits(32)
+        self.seed = seed
+        self.igraca = igraca
+        self.prvi = prvi
+        if dijeljenje == None:
+            dijeljenje = range(40)
+            random.Random(seed).shuffle(dijeljenje)
+        self.dijeljenje = dijeljenje
+        self.potezi = potezi or []
+        self.bodovi = tuple(bodovi)
+
+    def Pocetak(self):
+        """ The starting position, it deals the cards in the recorded order.
+        """
+        b = briskula(self.igraca)
+        b.fiksno_dijeljenje = True
+        b.karte = list(self.dijeljenje)
+        for i in range(self.igraca):
+            b.podjeli_karte_na_pocetku(i)
+        b.postavi_briskulu()
+        b.player_na_potezu = self.prvi
+        b.pobjednik = self.prvi - 1
+        return b
+
+    def Potez(self, state, move):
+        self.potezi.append(state.karte_igraca[state.player_na_potezu - 1][move])
+
+    def Kraj(self, state):
+        self.bodovi = tuple(state.bodovi)
+
+    def Pozicija(self, k):
+        """ The position before the k-th move (k = len(potezi) gives the final one).
+            Raise ValueError if a recorded card is not in the hand of the player to move.
+        """
+        b = self.Pocetak()
+        for karta in self.potezi[:k]:
+            ruka = b.karte_igraca[b.player_na_potezu - 1]
+            if karta not in ruka:
+                raise ValueError("karta " + str(karta) + " nije u ruci igraca " + str(b.player_na_potezu))
+            b.DoMove(ruka.index(karta))
+        return b
+
+    def Provjeri(self):
+        """ Replay the whole game and check that every move is legal, the game is over and
+            the final score is the recorded one. Return None if it is, else what is wrong.
+        """
+        try:
+            b = self.Pozicija(len(self.potezi))
+        except ValueError, e:
+            return str(e)
+        if b.GetMoves() != []:
+            return "igra nije gotova nakon " + str(len(self.potezi)) + " poteza"
+        if tuple(b.bodovi) != self.bodovi:
+            return "bodovi su " + str(tuple(b.bodovi)) + ", a u zapisu " + str(self.bodovi)
+        return None
+
+    def Zapakiraj(self):
+        return ZAGLAVLJE.pack(VERZIJA, self.igraca, self.prvi, self.seed & 0xFFFFFFFF, self.bodovi[0],
+                              self.bodovi[1], len(self.potezi)) + zapakiraj_karte(self.dijeljenje + self.potezi)
+
+    def __repr__(self):
+        return "ZapisIgre(seed=" + str(self.seed) + ", bodovi=" + str(self.bodovi) + ", " + str(len(self.potezi)) + " poteza)"
+
+
+def raspakiraj(podaci, pomak = 0):
+    """ Read the record at pomak in podaci, return (zapis, pomak of the next record).
+    """
+    verzija, igraca, prvi, seed, bodovi0, bodovi1, n = ZAGLAVLJE.unpack_from(podaci, pomak)
+    if verzija != VERZIJA:
+        raise ValueError("nepoznata verzija zapisa " + str(verzija))
+    pomak += ZAGLAVLJE.size
+    karte = raspakiraj_karte(podaci, 40 + n, pomak)
+    zapis = ZapisIgre(seed, igraca, prvi, karte[:40], karte[40:], (bodovi0, bodovi1))
+    return zapis, pomak + (6*(40 + n) + 7)/8
+
+def duljina_zapisa(podaci, pomak = 0):
+    """ Length in bytes of the record at pomak, or None if podaci ends before its header does.
+    """
+    if len(podaci) - pomak < ZAGLAVLJE.size:
+        return None
+    n = ZAGLAVLJE.unpack_from(podaci, pomak)[6]
+    return ZAGLAVLJE.size + (6*(40 + n) + 7)/8
+
+def citaj_zapise(datoteka, velicina_bloka = 1 << 20):
+    """ Yield every record in datoteka. The file is read in blocks of velicina_bloka bytes,
+        so even a file with millions of games is never all in memory.
+    """
+    with open(datoteka, "rb") as f:
+        podaci = ""
+        while True:
+            blok = f.read(velicina_bloka)
+            podaci += blok
+            pomak = 0
+            while True:
+                duljina = duljina_zapisa(podaci, pomak)
+                if duljina == None or pomak + duljina > len(podaci):
+                    break
+                zapis, pomak = raspakiraj(podaci, pomak)
+                yield zapis
+            podaci = podaci[pomak:]
+            if blok == "":
+                if podaci != "":
+                    raise ValueError(datoteka + " zavrsava nepotpunim zapisom")
+                return
+
+def provjeri_datoteku(datoteka, verbose = False):
+    """ Replay every game in datoteka in one pass. Return (broj igri, [(redni broj, greska)]).
+    """
+    greske = []
+    n = 0
+    for zapis in citaj_zapise(datoteka):
+        greska = zapis.Provjeri()
+        if greska != None:
+            greske.append((n, greska))
+        n += 1
+        if verbose and n % 10000 == 0:
+            print str(n) + " igri, " + str(len(greske)) + " gresaka"
+    return n, greske
+
+
+if __name__ == '__main__':
+    datoteka = sys.argv[1] if len(sys.argv) > 1 else raw_input("Datoteka sa zapisima igri? ")
+    n, greske = provjeri_datoteku(datoteka, verbose = True)
+    for redni, greska in greske:
+        print str(redni) + ". igra: " + greska
+    print "Provjereno " + str(n) + " igri, " + str(len(greske)) + " s greskom"
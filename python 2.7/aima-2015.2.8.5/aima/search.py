@@ -5,7 +5,9 @@ then create problem instances and solve them with calls to the various search
 functions."""
 
 from utils import *
-import math, random, sys, time, bisect, string
+import math, random, sys, time, bisect, string, copy, heapq, itertools, struct
+import array, collections
+import cPickle as pickle
 
 #______________________________________________________________________________
 
@@ -54,20 +56,27 @@ class Problem(object):
         abstract
 #______________________________________________________________________________
 
-class Node:
+class Node(object):
     """A node in a search tree. Contains a pointer to the parent (the node
     that this is a successor of) and to the actual state for this node. Note
     that if a state is arrived at by two paths, then there are two nodes with
     the same state.  Also includes the action that got us to this state, and
     the total path_cost (also known as g) to reach the node.  Other functions
     may add an f and h value; see best_first_graph_search and astar_search for
-    an explanation of how the f and h values are handled. You will not need to
-    subclass this class."""
+    an explanation of how the f and h values are handled. Nodes have
+    __slots__ and no __dict__, which makes them several times smaller, so
+    a searcher that keeps more on each node subclasses Node with the extra
+    slots (see SMANode); child_node makes children of the same class."""
+
+    __slots__ = ('state', 'parent', 'action', 'path_cost', 'depth', 'f', 'h')
 
     def __init__(self, state, parent=None, action=None, path_cost=0):
         "Create a search tree Node, derived from a parent by an action."
-        update(self, state=state, parent=parent, action=action,
-               path_cost=path_cost, depth=0)
+        self.state = state
+        self.parent = parent
+        self.action = action
+        self.path_cost = path_cost
+        self.depth = 0
         if parent:
             self.depth = parent.depth + 1
 
@@ -82,8 +91,9 @@ class Node:
     def child_node(self, problem, action):
         "Fig. 3.10"
         next = problem.result(self.state, action)
-        return Node(next, self, action,
-                    problem.path_cost(self.path_cost, self.state, action, next))
+        return self.__class__(next, self, action,
+                              problem.path_cost(self.path_cost, self.state,
+                                                action, next))
 
     def solution(self):
         "Return the sequence of actions to go from the root to this node."
@@ -108,6 +118,122 @@ class Node:
     def __hash__(self):
         return hash(self.state)
 
+def node_size(node):
+    """The bytes taken by node and its state (not counting objects shared
+    with other nodes, such as the parent and the action)."""
+    size = sys.getsizeof(node) + sys.getsizeof(node.state)
+    if hasattr(node, '__dict__'):
+        size += sys.getsizeof(node.__dict__)
+    return size
+
+#______________________________________________________________________________
+# Compact node storage: encoded states and a pool of nodes
+
+class PackedTupleEncoder:
+    """Encode a state that is a tuple of length small non-negative ints
+    (below 2**bits) as one int, and decode it back.  An 8-puzzle state
+    is then an int of 36 bits instead of a tuple of 9 ints; the codes hash
+    and compare like the states, so they can go in explored sets.  A value
+    that does not fit in bits bits raises ValueError (it would collide)."""
+
+    def __init__(self, length, bits=8):
+        update(self, length=length, bits=bits, mask=(1 << bits) - 1)
+
+    def encode(self, state):
+        code = 0
+        for x in reversed(state):
+            if not 0 <= x <= self.mask:
+                raise ValueError('%r does not fit in %d bits' % (x, self.bits))
+            code = (code << self.bits) | x
+        return code
+
+    def decode(self, code):
+        state = []
+        for i in range(self.length):
+            state.append(code & self.mask)
+            code >>= self.bits
+        return tuple(state)
+
+class BytesEncoder:
+    """Encode a state that is a sequence of ints in range(256) as a byte
+    string, one byte per entry, and decode it back to a tuple."""
+
+    def encode(self, state):
+        return array.array('B', state).tostring()
+
+    def decode(self, code):
+        return tuple(array.array('B', code))
+
+class NodePool:
+    """Search tree nodes stored as a structure of arrays rather than as one
+    Node object each.  Node i is an index: its parent is parents[i] (-1 for
+    a root), and its path cost, depth, state code and action are
+    path_costs[i], depths[i], codes[i] and actions[i].  A code is
+    encoder.encode(state), or the state itself when there is no encoder;
+    use pool.encode(state) to get the code to add.  Path costs are kept as
+    floats.  node(i, problem) rebuilds the Node chain for node i, so a
+    searcher can keep its frontier and explored set as indices and codes
+    and still return a Node."""
+
+    def __init__(self, encoder=None):
+        update(self, encoder=encoder, parents=array.array('l'),
+               path_costs=array.array('d'), depths=array.array('l'),
+               codes=[], actions=[])
+
+    def encode(self, state):
+        if self.encoder:
+            return self.encoder.encode(state)
+        return state
+
+    def add(self, code, parent=-1, action=None, path_cost=0):
+        "Add a node whose state has this code, and return its index."
+        depth = 0
+        if parent >= 0:
+            depth = self.depths[parent] + 1
+        self.parents.append(parent)
+        self.path_costs.append(path_cost)
+        self.depths.append(depth)
+        self.codes.append(code)
+        self.actions.append(action)
+        return len(self.codes) - 1
+
+    def state(self, i):
+        if self.encoder:
+            return self.encoder.decode(self.codes[i])
+        return self.codes[i]
+
+    def path(self, i):
+        "The indices of the nodes from the root to node i."
+        path_back = []
+        while i >= 0:
+            path_back.append(i)
+            i = self.parents[i]
+        return list(reversed(path_back))
+
+    def solution(self, i):
+        return [self.actions[j] for j in self.path(i)[1:]]
+
+    def node(self, i, problem):
+        "Node i as a chain of Nodes, regenerated along its path by problem."
+        path = self.path(i)
+        node = Node(self.state(path[0]))
+        for j in path[1:]:
+            node = node.child_node(problem, self.actions[j])
+        return node
+
+    def __len__(self):
+        return len(self.codes)
+
+    def bytes_per_node(self):
+        """The average bytes per node: the arrays, the lists and the codes
+        (actions are usually shared, so they are not counted)."""
+        if not self.codes:
+            return 0
+        size = sum(map(sys.getsizeof, [self.parents, self.path_costs,
+                                       self.depths, self.codes, self.actions]))
+        size += sum(map(sys.getsizeof, self.codes))
+        return size / float(len(self.codes))
+
 #______________________________________________________________________________
 
 class SimpleProblemSolvingAgentProgram:
@@ -153,7 +279,9 @@ def tree_search(problem, frontier):
 
 def graph_search(problem, frontier):
     """Search through the successors of a problem to find a goal.
-    The argument frontier should be an empty queue.
+    The argument frontier should be an empty queue; one that looks its
+    items up by state (like HashedStack(state_key)) keeps the test for
+    children already in the frontier from scanning it.
     If two paths reach a state, only use the first one. [Fig. 3.7]"""
     frontier.append(Node(problem.initial))
     explored = set()
@@ -167,6 +295,10 @@ def graph_search(problem, frontier):
                         and child not in frontier)
     return None
 
+def state_key(node):
+    "The key a hashed frontier indexes its nodes by."
+    return node.state
+
 def breadth_first_tree_search(problem):
     "Search the shallowest nodes in the search tree first."
     return tree_search(problem, FIFOQueue())
@@ -177,14 +309,14 @@ def depth_first_tree_search(problem):
 
 def depth_first_graph_search(problem):
     "Search the deepest nodes in the search tree first."
-    return graph_search(problem, Stack())
+    return graph_search(problem, HashedStack(state_key))
 
 def breadth_first_search(problem):
     "[Fig. 3.11]"
     node = Node(problem.initial)
     if problem.goal_test(node.state):
         return node
-    frontier = FIFOQueue()
+    frontier = HashedFIFOQueue(state_key)
     frontier.append(node)
     explored = set()
     while frontier:
@@ -197,6 +329,34 @@ def breadth_first_search(problem):
                 frontier.append(child)
     return None
 
+def breadth_first_pool_search(problem, encoder=None):
+    """breadth_first_search with its nodes in a NodePool: the frontier holds
+    node indices and the explored set state codes, so a generated node
+    costs a few array entries and a code instead of a Node and a state.
+    Use an encoder (PackedTupleEncoder, BytesEncoder) to make the codes
+    small.  Returns the same Node as breadth_first_search, or None."""
+    if problem.goal_test(problem.initial):
+        return Node(problem.initial)
+    pool = NodePool(encoder)
+    code = pool.encode(problem.initial)
+    frontier = collections.deque([pool.add(code)])
+    reached = set([code])             # explored states and frontier states
+    while frontier:
+        i = frontier.popleft()
+        state = pool.state(i)
+        for action in problem.actions(state):
+            child = problem.result(state, action)
+            code = pool.encode(child)
+            if code not in reached:
+                j = pool.add(code, i, action,
+                             problem.path_cost(pool.path_costs[i], state,
+                                               action, child))
+                if problem.goal_test(child):
+                    return pool.node(j, problem)
+                reached.add(code)
+                frontier.append(j)
+    return None
+
 def best_first_graph_search(problem, f):
     """Search the nodes with the lowest f scores first.
     You specify the function f(node) that you want to minimize; for example,
@@ -209,7 +369,7 @@ def best_first_graph_search(problem, f):
     node = Node(problem.initial)
     if problem.goal_test(node.state):
         return node
-    frontier = PriorityQueue(min, f)
+    frontier = PriorityQueue(min, f, state_key)
     frontier.append(node)
     explored = set()
     while frontier:
@@ -271,6 +431,89 @@ def astar_search(problem, h=None):
     h = memoize(h or problem.h, 'h')
     return best_first_graph_search(problem, lambda n: n.path_cost + h(n))
 
+#______________________________________________________________________________
+# Bidirectional search
+
+def reversed_problem(problem):
+    "A copy of problem that searches from its goal back to its initial state."
+    if isinstance(problem, InstrumentedProblem):
+        return ReversedInstrumentedProblem(problem)
+    reverse = copy.copy(problem)
+    reverse.initial, reverse.goal = problem.goal, problem.initial
+    return reverse
+
+def bidirectional_search(problem, potential=lambda state: 0):
+    """Search from the initial state and from the goal at once, always
+    expanding the side whose last expanded node had the lower key, until
+    the two searches meet on a shortest path. Each side is a uniform-cost
+    search on edge lengths reduced by a potential: the forward key of a node
+    is g + potential(state) and the backward key is g - potential(state).
+    mu is the length of the best path found through a state reached from
+    both sides; no shorter path exists once the two lowest keys add up to mu.
+    The problem must be a GraphProblem (the action to a neighbor is the
+    neighbor) whose links go both ways with the same length, as in an
+    UndirectedGraph. Returns a Node for the whole path, or None."""
+    if problem.goal_test(problem.initial):
+        return Node(problem.initial)
+    reverse = reversed_problem(problem)
+    sides = []
+    for p, sign in [(problem, 1), (reverse, -1)]:
+        node = Node(p.initial)
+        f = memoize(lambda n, sign=sign: n.path_cost + sign * potential(n.state), 'f')
+        frontier = PriorityQueue(min, f, state_key)
+        frontier.append(node)
+        sides.append(Struct(problem=p, f=f, frontier=frontier, explored=set(),
+                            reached={node.state: node}, last=f(node)))
+    mu, meet = infinity, None
+    while sides[0].frontier and sides[1].frontier:
+        side, other = sides
+        if other.last < side.last:
+            side, other = other, side
+        node = side.frontier.pop()
+        side.last = side.f(node)
+        if side.last + other.last >= mu:
+            break
+        side.explored.add(node.state)
+        for child in node.expand(side.problem):
+            if child.state in side.explored:
+                continue
+            incumbent = side.reached.get(child.state)
+            if incumbent is None or child.path_cost < incumbent.path_cost:
+                side.reached[child.state] = child
+                side.frontier.append(child)
+                if child.state in other.reached:
+                    cost = child.path_cost + other.reached[child.state].path_cost
+                    if cost < mu:
+                        mu, meet = cost, child.state
+    if meet is None:
+        return None
+    node, back = sides[0].reached[meet], sides[1].reached[meet].parent
+    while back:
+        node = node.child_node(problem, back.state)
+        back = back.parent
+    return node
+
+def bidirectional_uniform_cost_search(problem):
+    "Uniform-cost search from both ends of a GraphProblem at once."
+    return bidirectional_search(problem)
+
+def bidirectional_astar_search(problem):
+    """Bidirectional A* with the average of the two sides' heuristics:
+    problem.h estimates the distance to the goal and, on the reversed
+    problem, the distance back to the initial state. The potential
+    (h_forward - h_backward) / 2 keeps reduced lengths non-negative on both
+    sides when h is consistent, such as straight-line distance. Where either
+    h is infinite (GraphProblem.h without locations) the potential is 0,
+    as in bidirectional_uniform_cost_search."""
+    reverse = reversed_problem(problem)
+    def potential(state):
+        node = Node(state)
+        forward, backward = problem.h(node), reverse.h(node)
+        if infinity in (abs(forward), abs(backward)):
+            return 0
+        return (forward - backward) / 2.0
+    return bidirectional_search(problem, memoize(potential))
+
 #______________________________________________________________________________
 # Other search algorithms
 
@@ -287,7 +530,7 @@ def recursive_best_first_search(problem, h=None):
         for s in successors:
             s.f = max(s.path_cost + h(s), node.f)
         while True:
-            successors.sort(lambda x,y: cmp(x.f, y.f)) # Order by lowest f value
+            successors.sort(key=lambda node: node.f) # Order by lowest f value
             best = successors[0]
             if best.f > flimit:
                 return None, best.f
@@ -304,6 +547,171 @@ def recursive_best_first_search(problem, h=None):
     result, bestf = RBFS(problem, node, infinity)
     return result
 
+def iterative_deepening_astar_search(problem, h=None):
+    """IDA*: depth-first searches bounded by f = g + h, each one with the
+    bound raised to the smallest f that went over the previous bound.
+    Memory is only the current path; a child whose state is already on the
+    path is skipped, so states must be hashable."""
+    h = memoize(h or problem.h, 'h')
+
+    def DFS(node, bound, on_path):
+        f = node.path_cost + h(node)
+        if f > bound:
+            return None, f
+        if problem.goal_test(node.state):
+            return node, f
+        next_bound = infinity
+        for child in node.expand(problem):
+            if child.state in on_path:
+                continue
+            on_path.add(child.state)
+            result, t = DFS(child, bound, on_path)
+            on_path.remove(child.state)
+            if result is not None:
+                return result, t
+            next_bound = min(next_bound, t)
+        return None, next_bound
+
+    node = Node(problem.initial)
+    bound = h(node)
+    while bound < infinity:
+        result, bound = DFS(node, bound, set([node.state]))
+        if result is not None:
+            return result
+    return None
+
+class SMANode(Node):
+    "A Node with the bookkeeping sma_star_search keeps on each node."
+    __slots__ = ('fresh', 'kids', 'forgotten', 'alive')
+
+def sma_star_search(problem, max_nodes=1000, h=None):
+    """Simplified memory-bounded A*: expands the deepest lowest-f node one
+    successor at a time and, when more than max_nodes nodes are in memory,
+    forgets the shallowest highest-f leaf. Its parent remembers the
+    forgotten f, so the subtree is regenerated only when it looks best
+    again. Once every successor of a node has been generated, its f is
+    backed up to the minimum over its children and forgotten children.
+    The result is optimal if the shallowest solution path fits in max_nodes
+    nodes. A node without successors is selected once, for its goal test;
+    if it is not a goal its f becomes infinity. The best node and the worst
+    leaf are found with two heaps whose stale entries are skipped, and
+    which are compacted when either grows past 2 * max_nodes entries, so
+    forgotten nodes are not kept alive by them for long. A child is not
+    generated if a node in memory already reaches its state at no greater
+    cost (which also rules out cycles), so states must be hashable."""
+    h = memoize(h or problem.h, 'h')
+    counter = itertools.count()
+    open_heap, leaf_heap = [], []     # (f, -depth) and (-f, depth) order
+    reached = {}                      # state -> cheapest node in memory
+
+    def in_open(node):
+        return node.alive and (node.fresh or node.forgotten or
+                               (not node.kids and node.f < infinity))
+
+    def is_leaf(node):
+        return node.alive and not node.kids and node.parent
+
+    def push(node):
+        if in_open(node):
+            heapq.heappush(open_heap, (node.f, -node.depth, next(counter), node))
+        if is_leaf(node):
+            heapq.heappush(leaf_heap, (-node.f, node.depth, next(counter), node))
+
+    def remember(node):
+        node.fresh = list(reversed(problem.actions(node.state)))
+        node.kids, node.forgotten, node.alive = [], {}, True
+
+    def best_node():
+        while open_heap:
+            f, _, _, node = open_heap[0]
+            if in_open(node) and node.f == f:
+                return node
+            heapq.heappop(open_heap)
+        return None
+
+    def worst_leaf():
+        while leaf_heap:
+            f, _, _, node = heapq.heappop(leaf_heap)
+            if is_leaf(node) and node.f == -f:
+                return node
+        return None
+
+    def compact(heap, valid):
+        "Keep one valid entry per node in heap."
+        seen = set()
+        entries = []
+        for entry in heap:
+            node = entry[3]
+            if id(node) not in seen and valid(node, entry[0]):
+                seen.add(id(node))
+                entries.append(entry)
+        heap[:] = entries
+        heapq.heapify(heap)
+
+    def backup(node):
+        while node and not node.fresh:
+            f = min([kid.f for kid in node.kids] + node.forgotten.values()
+                    + [infinity])
+            if f == node.f:
+                return
+            node.f = f
+            push(node)
+            node = node.parent
+
+    root = SMANode(problem.initial)
+    root.f = h(root)
+    remember(root)
+    push(root)
+    reached[root.state] = root
+    used = 1
+    while True:
+        best = best_node()
+        if best is None or best.f == infinity:
+            return None
+        if problem.goal_test(best.state):
+            return best
+        if not (best.fresh or best.forgotten or best.kids):
+            best.f = infinity         # a dead end
+            push(best)
+            backup(best.parent)
+            continue
+        if best.fresh:
+            action, old_f = best.fresh.pop(), None
+        else:
+            action = argmin(best.forgotten.keys(), best.forgotten.get)
+            old_f = best.forgotten.pop(action)
+        child = best.child_node(problem, action)
+        other = reached.get(child.state)
+        if other is None or child.path_cost < other.path_cost:
+            if child.depth >= max_nodes - 1 and not problem.goal_test(child.state):
+                child.f = infinity
+            else:
+                child.f = max(best.f, child.path_cost + h(child))
+            if old_f is not None:
+                child.f = max(child.f, old_f)
+            remember(child)
+            reached[child.state] = child
+            best.kids.append(child)
+            used += 1
+            while used > max_nodes:
+                leaf = worst_leaf()
+                if leaf is None:
+                    break
+                parent = leaf.parent
+                parent.kids = [kid for kid in parent.kids if kid is not leaf]
+                parent.forgotten[leaf.action] = leaf.f
+                leaf.alive = False
+                if reached.get(leaf.state) is leaf:
+                    del reached[leaf.state]
+                used -= 1
+                push(parent)
+            push(child)
+        backup(best)
+        if len(open_heap) > 2 * max_nodes:
+            compact(open_heap, lambda node, f: in_open(node) and node.f == f)
+        if len(leaf_heap) > 2 * max_nodes:
+            compact(leaf_heap, lambda node, f: is_leaf(node) and node.f == -f)
+
 def hill_climbing(problem):
     """From the initial node, keep choosing the neighbor with highest value,
     stopping when no neighbor is better. [Fig. 4.2]"""
@@ -454,25 +862,177 @@ def RandomGraph(nodes=range(10), min_links=2, width=400, height=300,
     Then each node is connected to the min_links nearest neighbors.
     Because inverse links are added, some nodes will have more connections.
     The distance between nodes is the hypotenuse times curvature(),
-    where curvature() defaults to a random number between 1.1 and 1.5."""
+    where curvature() defaults to a random number between 1.1 and 1.5.
+    Nearest neighbors are found in a grid of square cells holding about two
+    nodes each, searched ring by ring outward from the node's cell, so the
+    time grows about linearly with the number of nodes. Ties go to the node
+    that comes first in nodes, and random numbers are drawn in the same
+    order as by a scan over all nodes, so a seed gives the same graph."""
     g = UndirectedGraph()
     g.locations = {}
     ## Build the cities
     for node in nodes:
         g.locations[node] = (random.randrange(width), random.randrange(height))
+    ## Put them in grid cells, remembering their order for ties
+    size = max(1.0, math.sqrt(2.0 * width * height / max(1, len(nodes))))
+    def cell((x, y)):
+        return int(x // size), int(y // size)
+    cells, order = {}, {}
+    for (i, node) in enumerate(nodes):
+        cells.setdefault(cell(g.locations[node]), []).append(node)
+        order.setdefault(node, i)
+    rings = int(max(width, height) // size) + 1
+    def ring(cx, cy, r):
+        "The cells r steps (in the max norm) away from cell (cx, cy)."
+        if r == 0:
+            return [(cx, cy)]
+        return ([(cx + dx, cy + dy) for dx in (-r, r) for dy in range(-r, r + 1)]
+                + [(cx + dx, cy + dy) for dy in (-r, r) for dx in range(-r + 1, r)])
+    def nearest_unlinked(node):
+        (x, y) = here = g.locations[node]
+        (cx, cy) = cell(here)
+        links = g.get(node)
+        best, best_key = None, (infinity, 0)
+        for r in range(rings + 1):
+            ## Nodes r or more rings out are at least this far away
+            edge = min(x - (cx - r + 1) * size, (cx + r) * size - x,
+                       y - (cy - r + 1) * size, (cy + r) * size - y)
+            if best_key[0] < edge:
+                break
+            for c in ring(cx, cy, r):
+                for n in cells.get(c, ()):
+                    if n is node or links.get(n): continue
+                    (nx, ny) = g.locations[n]
+                    key = (math.hypot(nx - x, ny - y), order[n])
+                    if key < best_key:
+                        best, best_key = n, key
+        return best
     ## Build roads from each city to at least min_links nearest neighbors.
     for i in range(min_links):
         for node in nodes:
             if len(g.get(node)) < min_links:
                 here = g.locations[node]
-                def distance_to_node(n):
-                    if n is node or g.get(node,n): return infinity
-                    return distance(g.locations[n], here)
-                neighbor = argmin(nodes, distance_to_node)
+                neighbor = nearest_unlinked(node)
+                if neighbor is None:
+                    neighbor = nodes[0]     # as argmin does when all are linked
                 d = distance(g.locations[neighbor], here) * curvature()
                 g.connect(node, neighbor, int(d))
     return g
 
+class CSRGraph:
+    """A graph on the nodes 0..n-1 stored in compressed sparse row form as
+    three NumPy arrays: the links out of node a go to the (sorted) nodes
+    targets[offsets[a]:offsets[a+1]], with lengths weights[offsets[a]:
+    offsets[a+1]]. It has the get and nodes methods of Graph, so GraphProblem
+    and the graph searchers accept it, but it takes 12 to 16 bytes a link
+    instead of a dict entry. An undirected CSRGraph stores both directions
+    of every link. Build one with CSRGraph.from_edges or from_graph; save
+    writes it to one file and CSRGraph.load maps that file into memory
+    instead of reading it. NumPy is only imported when it is needed."""
+
+    def __init__(self, offsets, targets, weights, directed=True):
+        update(self, offsets=offsets, targets=targets, weights=weights,
+               directed=directed)
+
+    def get(self, a, b=None):
+        """Return a link distance or a dict of {node: distance} entries,
+        like Graph.get."""
+        lo, hi = self.offsets[a], self.offsets[a + 1]
+        if b is None:
+            return dict(zip(self.targets[lo:hi].tolist(),
+                            self.weights[lo:hi].tolist()))
+        i = lo + self.targets[lo:hi].searchsorted(b)
+        if i < hi and self.targets[i] == b:
+            return self.weights[i].item()
+        return None
+
+    def nodes(self):
+        return range(len(self.offsets) - 1)
+
+    def reversed(self):
+        "The CSRGraph with every link turned around."
+        import numpy
+        n = len(self.offsets) - 1
+        sources = numpy.repeat(numpy.arange(n), numpy.diff(self.offsets))
+        return CSRGraph.from_edges(n, self.targets, sources, self.weights)
+
+    def from_edges(n, sources, targets, weights, directed=True):
+        """Build a CSRGraph on n nodes with a link from sources[i] to
+        targets[i] of length weights[i] for each i (given once per link if
+        the graph is undirected)."""
+        import numpy
+        sources = numpy.asarray(sources, dtype=numpy.int32)
+        targets = numpy.asarray(targets, dtype=numpy.int32)
+        weights = numpy.asarray(weights)
+        if not directed:
+            sources, targets = (numpy.concatenate([sources, targets]),
+                                numpy.concatenate([targets, sources]))
+            weights = numpy.concatenate([weights, weights])
+        order = numpy.lexsort((targets, sources))
+        offsets = numpy.zeros(n + 1, dtype=numpy.int64)
+        numpy.cumsum(numpy.bincount(sources, minlength=n), out=offsets[1:])
+        return CSRGraph(offsets, targets[order], weights[order], directed)
+    from_edges = staticmethod(from_edges)
+
+    def from_graph(graph):
+        """Convert a Graph. Return the CSRGraph and the list of the graph's
+        nodes, so that node i of the CSRGraph is names[i]. Locations, if
+        any, are carried over."""
+        names = set(graph.nodes())
+        for a in graph.nodes():
+            names.update(graph.get(a))
+        names = sorted(names)
+        ids = dict((name, i) for (i, name) in enumerate(names))
+        links = [(ids[a], ids[b], length) for a in graph.nodes()
+                 for (b, length) in graph.get(a).items()]
+        sources, targets, weights = zip(*links) or ([], [], [])
+        csr = CSRGraph.from_edges(len(names), sources, targets, weights)
+        csr.directed = graph.directed
+        locs = getattr(graph, 'locations', None)
+        if locs:
+            csr.locations = dict((ids[a], locs[a]) for a in locs if a in ids)
+        return csr, names
+    from_graph = staticmethod(from_graph)
+
+    def save(self, filename):
+        """Write the graph to a file: a header, then the offsets, targets
+        and weights arrays, each padded to a multiple of 8 bytes."""
+        import numpy
+        f = open(filename, 'wb')
+        try:
+            f.write(CSR_HEADER.pack('CSR1', self.directed, len(self.offsets) - 1,
+                                    len(self.targets), self.weights.dtype.str))
+            for (values, dtype) in [(self.offsets, '<i8'), (self.targets, '<i4'),
+                                    (self.weights, self.weights.dtype.str)]:
+                data = numpy.ascontiguousarray(values, dtype=dtype).tostring()
+                f.write(data + '\0' * (-len(data) % 8))
+        finally:
+            f.close()
+
+    def load(filename):
+        "Map a file written by save into memory, read-only."
+        import numpy
+        f = open(filename, 'rb')
+        try:
+            header = f.read(CSR_HEADER.size)
+        finally:
+            f.close()
+        magic, directed, n, m, wtype = CSR_HEADER.unpack(header)
+        if magic != 'CSR1':
+            raise ValueError('%s is not a CSRGraph file' % filename)
+        arrays, offset = [], CSR_HEADER.size
+        for (dtype, count) in [('<i8', n + 1), ('<i4', m), (wtype.rstrip('\0'), m)]:
+            if count:
+                arrays.append(numpy.memmap(filename, dtype, 'r', offset,
+                                           (count,)).view(numpy.ndarray))
+            else:
+                arrays.append(numpy.zeros(0, dtype))
+            offset += -(-numpy.dtype(dtype).itemsize * count // 8) * 8
+        return CSRGraph(arrays[0], arrays[1], arrays[2], bool(directed))
+    load = staticmethod(load)
+
+CSR_HEADER = struct.Struct('<4s?3xqq8s')  # magic, directed, nodes, links, weight dtype
+
 romania = UndirectedGraph(Dict(
     A=Dict(Z=75, S=140, T=118),
     B=Dict(U=85, P=101, G=90, F=211),
@@ -503,10 +1063,13 @@ australia.locations = Dict(WA=(120, 24), NT=(135, 20), SA=(135, 30),
                            Q=(145, 20), NSW=(145, 32), T=(145, 42), V=(145, 37))
 
 class GraphProblem(Problem):
-    "The problem of searching a graph from one node to another."
-    def __init__(self, initial, goal, graph):
+    """The problem of searching a graph from one node to another.
+    If landmarks (a Landmarks table for the graph) are given, h also uses
+    their lower bound on the distance to the goal."""
+    def __init__(self, initial, goal, graph, landmarks=None):
         Problem.__init__(self, initial, goal)
         self.graph = graph
+        self.landmarks = landmarks
 
     def actions(self, A):
         "The actions at a graph node are just its neighbors."
@@ -520,13 +1083,194 @@ class GraphProblem(Problem):
         return cost_so_far + (self.graph.get(A,B) or infinity)
 
     def h(self, node):
-        "h function is straight-line distance from a node's state to goal."
+        """h function is straight-line distance from a node's state to goal,
+        or the landmark bound if there are landmarks and it is larger."""
         locs = getattr(self.graph, 'locations', None)
+        if self.landmarks:
+            bound = self.landmarks.h(node.state, self.goal)
+            if locs:
+                return max(bound, int(distance(locs[node.state], locs[self.goal])))
+            return bound
         if locs:
             return int(distance(locs[node.state], locs[self.goal]))
         else:
             return infinity
 
+#______________________________________________________________________________
+# Shortest-path trees and landmark (ALT) lower bounds on graph distances
+
+def dijkstra(graph, source):
+    """Return two dicts, the distance from source to every node it reaches
+    and each such node's predecessor on a shortest path (None for source).
+    A link of length 0 is no link, as in GraphProblem.path_cost."""
+    dist, parent = {source: 0}, {source: None}
+    frontier = [(0, source)]
+    done = set()
+    while frontier:
+        d, a = heapq.heappop(frontier)
+        if a in done:
+            continue
+        done.add(a)
+        for (b, length) in graph.get(a).items():
+            if not length:
+                continue
+            if b not in dist or d + length < dist[b]:
+                dist[b], parent[b] = d + length, a
+                heapq.heappush(frontier, (d + length, b))
+    return dist, parent
+
+def reversed_graph(graph):
+    "A graph with every link turned around (an undirected graph is its own)."
+    if not graph.directed:
+        return graph
+    if isinstance(graph, CSRGraph):
+        return graph.reversed()
+    reverse = Graph()
+    for a in graph.nodes():
+        for (b, length) in graph.get(a).items():
+            reverse.connect1(b, a, length)
+    return reverse
+
+class Landmarks:
+    """Distances from and to k landmark nodes of a graph, giving the ALT
+    lower bound on the distance from v to t by the triangle inequality:
+        max over landmarks L of d(L, t) - d(L, v) and d(v, L) - d(t, L).
+    The bound is admissible and consistent, so use it with astar_search
+    through GraphProblem(initial, goal, graph, landmarks). Landmarks are
+    chosen farthest-first: each new one is the node farthest from those
+    already chosen. Building costs 2k runs of dijkstra (k if undirected);
+    save the tables and load them for later queries on the same graph.
+    Landmarks() with no graph is empty."""
+
+    def __init__(self, graph=None, k=4, landmarks=None):
+        self.landmarks, self.from_landmark, self.to_landmark = [], {}, {}
+        if graph is None:
+            return
+        reverse = reversed_graph(graph)
+        if landmarks is not None:
+            for L in landmarks:
+                self.add(graph, reverse, L)
+            return
+        nearest = dijkstra(graph, graph.nodes()[0])[0]
+        for i in range(k):
+            L = argmax(sorted(nearest), nearest.get)
+            if i > 0 and nearest[L] == 0:
+                break               # every node is already a landmark
+            d = self.add(graph, reverse, L)
+            if i == 0:
+                nearest = d
+            else:
+                nearest = dict((v, min(nearest[v], d.get(v, infinity)))
+                               for v in nearest)
+
+    def add(self, graph, reverse, L):
+        """Add landmark L, with its distances from and to every node.
+        Return the distances from L."""
+        self.landmarks.append(L)
+        d_from = dijkstra(graph, L)[0]
+        d_to = dijkstra(reverse, L)[0] if reverse is not graph else d_from
+        for table, d in [(self.from_landmark, d_from), (self.to_landmark, d_to)]:
+            for v in table:
+                table[v] += (d.get(v, infinity),)
+            for v in d:
+                if v not in table:
+                    table[v] = (infinity,) * (len(self.landmarks) - 1) + (d[v],)
+        return d_from
+
+    def h(self, v, t):
+        "A lower bound on the distance from v to t."
+        none = (infinity,) * len(self.landmarks)
+        from_v, from_t = self.from_landmark.get(v, none), self.from_landmark.get(t, none)
+        to_v, to_t = self.to_landmark.get(v, none), self.to_landmark.get(t, none)
+        best = 0
+        for i in range(len(self.landmarks)):
+            if from_v[i] < infinity:
+                if from_t[i] == infinity:
+                    return infinity      # t is not reachable from v
+                best = max(best, from_t[i] - from_v[i])
+            if to_t[i] < infinity:
+                if to_v[i] == infinity:
+                    return infinity
+                best = max(best, to_v[i] - to_t[i])
+        return best
+
+    def save(self, filename):
+        "Write the tables to a file; Landmarks.load(filename) reads them back."
+        f = open(filename, 'wb')
+        try:
+            pickle.dump((self.landmarks, self.from_landmark, self.to_landmark),
+                        f, pickle.HIGHEST_PROTOCOL)
+        finally:
+            f.close()
+
+    def load(filename):
+        "Read tables written by save."
+        f = open(filename, 'rb')
+        try:
+            tables = pickle.load(f)
+        finally:
+            f.close()
+        landmarks = Landmarks()
+        landmarks.landmarks, landmarks.from_landmark, landmarks.to_landmark = tables
+        return landmarks
+    load = staticmethod(load)
+
+class DistanceOracle:
+    """Answers repeated shortest-path queries on one graph from a few
+    origins. The first query from an origin runs dijkstra to every node;
+    the distances and predecessors are kept for the capacity most recently
+    used origins (trees is ordered from least to most recently used), and
+    later queries from them just follow predecessors.
+    oracle.search(problem) can stand in for uniform_cost_search on a
+    GraphProblem over the same graph (it raises ValueError for a problem on
+    another graph). If the graph changes, call clear()."""
+
+    def __init__(self, graph, capacity=16):
+        update(self, graph=graph, capacity=capacity,
+               trees=collections.OrderedDict(), hits=0, misses=0)
+
+    def tree(self, origin):
+        "The (distances, predecessors) dicts of dijkstra from origin."
+        if origin in self.trees:
+            self.hits += 1
+            tree = self.trees.pop(origin)
+        else:
+            self.misses += 1
+            if len(self.trees) >= self.capacity:
+                self.trees.popitem(last=False)
+            tree = dijkstra(self.graph, origin)
+        self.trees[origin] = tree
+        return tree
+
+    def distance(self, origin, goal):
+        return self.tree(origin)[0].get(goal, infinity)
+
+    def path(self, origin, goal):
+        "The nodes on a shortest path from origin to goal, or None."
+        parent = self.tree(origin)[1]
+        if goal not in parent:
+            return None
+        path = [goal]
+        while parent[path[-1]] is not None:
+            path.append(parent[path[-1]])
+        path.reverse()
+        return path
+
+    def search(self, problem):
+        "A Node for the shortest path of a GraphProblem, as a searcher returns."
+        if problem.graph is not self.graph:
+            raise ValueError('problem is not on the graph of this oracle')
+        path = self.path(problem.initial, problem.goal)
+        if path is None:
+            return None
+        node = Node(path[0])
+        for state in path[1:]:
+            node = node.child_node(problem, state)
+        return node
+
+    def clear(self):
+        self.trees.clear()
+
 #______________________________________________________________________________
 
 class NQueensProblem(Problem):
@@ -801,6 +1545,30 @@ class InstrumentedProblem(Problem):
         return '<%4d/%4d/%4d/%s>' % (self.succs, self.goal_tests,
                                      self.states, str(self.found)[:4])
 
+class ReversedInstrumentedProblem(InstrumentedProblem):
+    """The reversed_problem of an InstrumentedProblem. Its counts go to the
+    InstrumentedProblem it reverses, so that a bidirectional search is
+    charged for the steps of both directions."""
+
+    def __init__(self, forward):
+        InstrumentedProblem.__init__(self, reversed_problem(forward.problem))
+        self.forward = forward
+
+    def actions(self, state):
+        self.forward.succs += 1
+        return self.problem.actions(state)
+
+    def result(self, state, action):
+        self.forward.states += 1
+        return self.problem.result(state, action)
+
+    def goal_test(self, state):
+        self.forward.goal_tests += 1
+        return self.problem.goal_test(state)
+
+    def __repr__(self):
+        return repr(self.forward)
+
 def compare_searchers(problems, header,
                       searchers=[breadth_first_tree_search,
                                  breadth_first_search, depth_first_graph_search,
@@ -849,6 +1617,125 @@ __doc__ += """
 ['S', 'R', 'P', 'B']
 >>> recursive_best_first_search(ab).solution()
 ['S', 'R', 'P', 'B']
+>>> iterative_deepening_astar_search(ab).solution()
+['S', 'R', 'P', 'B']
+>>> sma_star_search(ab).solution()
+['S', 'R', 'P', 'B']
+>>> sma_star_search(ab, max_nodes=8).solution()
+['S', 'R', 'P', 'B']
+>>> sma_star_search(ab, max_nodes=4).solution()
+['S', 'F', 'B']
+>>> sma_star_search(ab, max_nodes=3)
+>>> sink = GraphProblem('A', 'B', Graph(dict(A=dict(B=1, C=1), C=dict(D=1))))
+>>> sma_star_search(sink, max_nodes=2, h=lambda node: 0).solution()
+['B']
+>>> sma_star_search(GraphProblem('A', 'D', sink.graph), h=lambda node: 0).solution()
+['C', 'D']
+>>> sma_star_search(GraphProblem('B', 'A', sink.graph), h=lambda node: 0)
+>>> dijkstra(romania, 'A')[0]['B']
+418
+>>> landmarks = Landmarks(romania, 3)
+>>> landmarks.landmarks
+['N', 'T', 'E']
+>>> landmarks.h('A', 'B')
+418
+>>> astar_search(GraphProblem('A', 'B', romania, landmarks)).solution()
+['S', 'R', 'P', 'B']
+>>> oracle = DistanceOracle(romania, capacity=2)
+>>> oracle.search(ab).solution()
+['S', 'R', 'P', 'B']
+>>> oracle.distance('A', 'B'), oracle.path('A', 'N')
+(418, ['A', 'S', 'R', 'P', 'B', 'U', 'V', 'I', 'N'])
+>>> oracle.path('O', 'A'), oracle.distance('B', 'A'), oracle.distance('A', 'O')
+(['O', 'Z', 'A'], 418, 146)
+>>> oracle.hits, oracle.misses, oracle.trees.keys()
+(2, 4, ['B', 'A'])
+>>> gap = UndirectedGraph(dict(A=dict(B=0, C=3), C=dict(B=2)))
+>>> DistanceOracle(gap).search(GraphProblem('A', 'B', gap)).solution()
+['C', 'B']
+>>> uniform_cost_search(GraphProblem('A', 'B', gap)).solution()
+['C', 'B']
+>>> oracle.search(GraphProblem('T', 'WA', australia))
+Traceback (most recent call last):
+    ...
+ValueError: problem is not on the graph of this oracle
+>>> islands = UndirectedGraph(dict(A=dict(B=1), C=dict(D=2)))
+>>> DistanceOracle(islands).search(GraphProblem('A', 'D', islands))
+>>> import os, tempfile
+>>> filename = tempfile.mktemp()
+>>> landmarks.save(filename)
+>>> Landmarks.load(filename).h('O', 'N') == landmarks.h('O', 'N')
+True
+>>> os.remove(filename)
+
+>>> random.seed(1)
+>>> g = RandomGraph(range(2000), min_links=3, width=100000, height=100000)
+>>> min(len(g.get(node)) for node in g.nodes()), len(g.nodes())
+(3, 2000)
+>>> random.seed(1)
+>>> RandomGraph(range(2000), min_links=3, width=100000, height=100000).dict == g.dict
+True
+>>> csr, names = CSRGraph.from_graph(romania)
+>>> names.index('A'), names.index('B'), csr.get(0) == dict((names.index(b), d) for (b, d) in romania.get('A').items())
+(0, 1, True)
+>>> csr.get(0, names.index('S')), csr.get(0, 1)
+(140, None)
+>>> [names[i] for i in astar_search(GraphProblem(0, 1, csr)).solution()]
+['S', 'R', 'P', 'B']
+>>> csr.save(filename)
+>>> loaded = CSRGraph.load(filename)
+>>> uniform_cost_search(GraphProblem(0, 1, loaded)).path_cost, loaded.directed
+(418, False)
+>>> directed = CSRGraph.from_edges(3, [0, 1, 0], [1, 2, 2], [1.0, 1.0, 5.0])
+>>> uniform_cost_search(GraphProblem(0, 2, directed)).path_cost
+2.0
+>>> directed.get(2), directed.reversed().get(2)
+({}, {0: 5.0, 1: 1.0})
+>>> del loaded; os.remove(filename)
+>>> bidirectional_uniform_cost_search(ab).solution()
+['S', 'R', 'P', 'B']
+>>> bidirectional_astar_search(ab).solution()
+['S', 'R', 'P', 'B']
+>>> bidirectional_astar_search(GraphProblem('O', 'N', romania)).path_cost
+835
+>>> plain = UndirectedGraph(dict(A=dict(B=1, C=5), B=dict(C=1)))
+>>> bidirectional_astar_search(GraphProblem('A', 'C', plain)).solution()
+['B', 'C']
+>>> bidirectional_astar_search(GraphProblem('A', 'A', romania)).solution()
+[]
+>>> bidirectional_uniform_cost_search(GraphProblem('T', 'WA', australia))
+>>> p = InstrumentedProblem(ab)
+>>> reverse = reversed_problem(p)
+>>> reverse.initial, len(reverse.actions('B')), p.succs
+('B', 4, 1)
+>>> breadth_first_pool_search(ab).solution()
+['S', 'F', 'B']
+>>> breadth_first_pool_search(GraphProblem('T', 'WA', australia))
+>>> node = breadth_first_pool_search(GraphProblem(0, 1, csr))
+>>> [names[i] for i in node.solution()], node.path_cost
+(['S', 'F', 'B'], 450)
+>>> encoder = PackedTupleEncoder(9, bits=4)
+>>> hex(encoder.encode((1, 2, 3, 4, 5, 6, 7, 8, 0)))
+'0x87654321'
+>>> encoder.decode(encoder.encode((1, 2, 3, 4, 5, 6, 7, 8, 0)))
+(1, 2, 3, 4, 5, 6, 7, 8, 0)
+>>> encoder.encode((16, 0))
+Traceback (most recent call last):
+    ...
+ValueError: 16 does not fit in 4 bits
+>>> BytesEncoder().decode(BytesEncoder().encode((1, 2, 255)))
+(1, 2, 255)
+>>> pool = NodePool(encoder)
+>>> root = pool.add(encoder.encode(tuple(range(9))))
+>>> pool.add(encoder.encode((1, 0, 2, 3, 4, 5, 6, 7, 8)), root, 'R', 1)
+1
+>>> pool.state(1), pool.solution(1), pool.depths[1], len(pool)
+((1, 0, 2, 3, 4, 5, 6, 7, 8), ['R'], 1, 2)
+>>> node = Node((1, 2, 3, 4, 5, 6, 7, 8, 0))
+>>> node.color = 'red'
+Traceback (most recent call last):
+    ...
+AttributeError: 'Node' object has no attribute 'color'
 
 >>> board = list('SARTELNID')
 >>> print_boggle(board)
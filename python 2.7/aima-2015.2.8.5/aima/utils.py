@@ -3,7 +3,7 @@
 """
 
 from __future__ import generators
-import operator, math, random, copy, sys, os.path, bisect, re
+import operator, math, random, copy, sys, os.path, bisect, re, collections, heapq
 
 assert (2,5) <= sys.version_info < (3,), """\
 This code is meant for Python 2.5 through 2.7.
@@ -681,13 +681,16 @@ def unimplemented():
     raise NotImplementedError
 
 #______________________________________________________________________________
-# Queues: Stack, FIFOQueue, PriorityQueue
+# Queues: Stack, FIFOQueue, PriorityQueue, HashedStack, HashedFIFOQueue
 
 class Queue:
     """Queue is an abstract class/interface. There are three types:
         Stack(): A Last In First Out Queue.
         FIFOQueue(): A First In First Out Queue.
-        PriorityQueue(order, f): Queue in sorted order (default min-first).
+        PriorityQueue(order, f, key): Queue in sorted order (default min-first).
+        HashedStack(key), HashedFIFOQueue(key): like Stack and FIFOQueue,
+            but they hold at most one item per key(item), and item in q
+            takes constant time.
     Each type supports the following methods and functions:
         q.append(item)  -- add an item to the queue
         q.extend(items) -- equivalent to: for item in items: q.append(item)
@@ -727,33 +730,112 @@ class FIFOQueue(Queue):
     def __contains__(self, item):
         return item in self.A[self.start:]
 
+class HashedStack(Queue):
+    """A Last-In-First-Out Queue that keeps a dict from key(item) to item, so
+    membership tests and q[item] lookups (which return the queued item with
+    the same key) are constant time. An item whose key
+    is already in the queue is not added again. With key=lambda n: n.state
+    this is a frontier for graph search over millions of states."""
+    def __init__(self, key=lambda x: x):
+        update(self, A=[], index={}, key=key)
+    def append(self, item):
+        k = self.key(item)
+        if k not in self.index:
+            self.index[k] = item
+            self.A.append(item)
+    def __len__(self):
+        return len(self.A)
+    def pop(self):
+        item = self.A.pop()
+        del self.index[self.key(item)]
+        return item
+    def __contains__(self, item):
+        return self.key(item) in self.index
+    def __getitem__(self, item):
+        return self.index[self.key(item)]
+
+class HashedFIFOQueue(HashedStack):
+    """A First-In-First-Out Queue with the same key index as HashedStack."""
+    def __init__(self, key=lambda x: x):
+        update(self, A=collections.deque(), index={}, key=key)
+    def pop(self):
+        item = self.A.popleft()
+        del self.index[self.key(item)]
+        return item
+
+class Reversed:
+    """Wraps a value so that it compares in the reverse order: a max-first
+    PriorityQueue keeps Reversed(f(item)) in a min-heap, which works for any
+    comparable f, not only numbers."""
+    def __init__(self, value):
+        self.value = value
+    def __cmp__(self, other):
+        return cmp(other.value, self.value)
+
 class PriorityQueue(Queue):
     """A queue in which the minimum (or maximum) element (as determined by f and
     order) is returned first. If order is min, the item with minimum f(x) is
     returned first; if order is max, then it is the item with maximum f(x).
-    Also supports dict-like lookup."""
-    def __init__(self, order=min, f=lambda x: x):
-        update(self, A=[], order=order, f=f)
+    Items with equal f come out first-in-first-out with order min and
+    last-in-first-out with order max. Also supports dict-like lookup.
+    Items are kept in a binary heap; a removed item is only marked invalid
+    and skipped when it reaches the top. Without a key the queue may hold
+    equal items, and lookup scans for an equal item. With a key it holds at
+    most one item per key(item): q[item] is the queued item with the same
+    key, lookup takes constant time, and appending an item whose key is
+    already queued replaces the old one (decrease-key) in O(log n)."""
+    def __init__(self, order=min, f=lambda x: x, key=None):
+        update(self, A=[], index={}, order=order, f=f, key=key, count=0,
+               size=0)
     def append(self, item):
-        bisect.insort(self.A, (self.f(item), item))
-    def __len__(self):
-        return len(self.A)
-    def pop(self):
+        if self.key:
+            k = self.key(item)
+            if k in self.index:
+                self.index[k][3] = False
+                self.size -= 1
+        self.count += 1
         if self.order == min:
-            return self.A.pop(0)[1]
+            entry = [self.f(item), self.count, item, True]
         else:
-            return self.A.pop()[1]
+            entry = [Reversed(self.f(item)), -self.count, item, True]
+        if self.key:
+            self.index[k] = entry
+        self.size += 1
+        heapq.heappush(self.A, entry)
+        if len(self.A) > 2 * self.size + 64:
+            self.A = [e for e in self.A if e[3]]
+            heapq.heapify(self.A)
+    def __len__(self):
+        return self.size
+    def pop(self):
+        while self.A:
+            entry = heapq.heappop(self.A)
+            if entry[3]:
+                if self.key:
+                    del self.index[self.key(entry[2])]
+                self.size -= 1
+                return entry[2]
+        raise IndexError('pop from empty PriorityQueue')
+    def entry(self, item):
+        "The valid heap entry for item (the one to be popped first), or None."
+        if self.key:
+            return self.index.get(self.key(item))
+        entries = [e for e in self.A if e[3] and e[2] == item]
+        if entries:
+            return min(entries)
     def __contains__(self, item):
-        return some(lambda (_, x): x == item, self.A)
-    def __getitem__(self, key):
-        for _, item in self.A:
-            if item == key:
-                return item
-    def __delitem__(self, key):
-        for i, (value, item) in enumerate(self.A):
-            if item == key:
-                self.A.pop(i)
-                return
+        return self.entry(item) is not None
+    def __getitem__(self, item):
+        entry = self.entry(item)
+        if entry:
+            return entry[2]
+    def __delitem__(self, item):
+        entry = self.entry(item)
+        if entry:
+            entry[3] = False
+            self.size -= 1
+            if self.key:
+                del self.index[self.key(item)]
 
 ## Fig: The idea is we can define things like Fig[3,10] later.
 ## Alas, it is Fig[3,10] not Fig[3.10], because that would be the same
@@ -862,6 +944,19 @@ calculating gnp ...
 >>> qtest(FIFOQueue())
 [1, 8, 2, 7, 5, 6, -99, 99, 4, 3, 0]
 
+>>> qtest(HashedStack())
+[0, 3, 4, 99, -99, 6, 5, 7, 2, 8, 1]
+
+>>> qtest(HashedFIFOQueue())
+[1, 8, 2, 7, 5, 6, -99, 99, 4, 3, 0]
+
+>>> q = HashedFIFOQueue(abs)
+>>> q.extend([3, -3, 4, 3])
+>>> len(q), -3 in q, q[3], 5 in q
+(2, True, 3, False)
+>>> q.pop(), 3 in q, len(q)
+(3, False, 1)
+
 >>> qtest(PriorityQueue(min))
 [-99, 0, 1, 2, 3, 4, 5, 6, 7, 8, 99]
 
@@ -874,6 +969,26 @@ calculating gnp ...
 >>> qtest(PriorityQueue(max, abs))
 [99, -99, 8, 7, 6, 5, 4, 3, 2, 1, 0]
 
+>>> q = PriorityQueue(min)
+>>> q.extend([3, 1, 3])
+>>> len(q), q.pop(), q.pop(), q.pop(), len(q)
+(3, 1, 3, 3, 0)
+>>> q = PriorityQueue(min, len)
+>>> q.extend([[1, 2], [3]])
+>>> [1, 2] in q, q.pop()
+(True, [3])
+>>> q = PriorityQueue(max, lambda s: s)
+>>> q.extend(['b', 'c', 'a'])
+>>> [q.pop() for i in range(len(q))]
+['c', 'b', 'a']
+>>> q = PriorityQueue(min, lambda (name, cost): cost, lambda (name, cost): name)
+>>> q.extend([('a', 5), ('b', 3), ('c', 4), ('a', 1)])
+>>> len(q), q[('b', None)]
+(3, ('b', 3))
+>>> del q[('c', None)]
+>>> [q.pop() for i in range(len(q))]
+[('a', 1), ('b', 3)]
+
 >>> vals = [100, 110, 160, 200, 160, 110, 200, 200, 220]
 >>> histogram(vals)
 [(100, 1), (110, 2), (160, 2), (200, 3), (220, 1)]